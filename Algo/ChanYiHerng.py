@@ -1,38 +1,91 @@
 # Greedy Best-First Search
 
-import heapq
-from allItem import StateKey, State, successors, is_goal_key, Metrics, heuristic_trips_remaining, run_single, run_all_extended, bfs_optimal_length
+import random
+from array import array
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, State, successors, is_goal_key, Metrics, heuristic_trips_remaining, make_queue, run_single, run_all_extended, run_all_timed
+from stateGraph import GraphTree, start_graph
+from heuristics import resolve_heuristic, compare_heuristics
+from retrograde import optimal_lengths
 from data import TEST_CASES
 
 ALGO_NAME = "Greedy Best-First"
 
-def greedy_solver(start: StateKey, metr: Metrics):
-    tie = 0
-    pq = []
+def greedy_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, heuristic=heuristic_trips_remaining, queue: str = "heap", events=None):
+    heuristic = resolve_heuristic(heuristic, spec)
+    pq = make_queue(queue)
+    succ, push, pop = successors, pq.push, pq.pop
+    if events:
+        succ, push, pop = events.successors, events.timed("queue", pq.push), events.timed("queue", pq.pop)
     start_state = State(start, 0, None, None)
-    heapq.heappush(pq, (heuristic_trips_remaining(start), tie, start_state))
+    push(heuristic(start, spec), 0, start_state)
     visited = set()
     while pq:
         metr.track_frontier(len(pq))
-        h, _, u = heapq.heappop(pq)
+        h, _, u = pop()
         if u.key in visited:
+            if events:
+                events.prune(u)
             continue
         visited.add(u.key)
         metr.bump()
+        if events:
+            events.expand(u)
         if is_goal_key(u.key):
+            if events:
+                events.goal(u)
             return u
-        for v in successors(u, order="random"):
+        for v in succ(u, order="random", spec=spec):
             if v.key not in visited:
-                tie += 1
-                heapq.heappush(pq, (heuristic_trips_remaining(v.key), tie, v))
+                push(heuristic(v.key, spec), 0, v)
+            elif events:
+                events.prune(v)
+    return None
+
+
+def greedy_solver_graph(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, heuristic=heuristic_trips_remaining, queue: str = "heap"):
+    heuristic = resolve_heuristic(heuristic, spec)
+    # same search as greedy_solver over the precompiled StateGraph;
+    # each push is a record (target, parent, move) numbered in push order
+    graph, s0 = start_graph(start, spec)
+    if s0 is None:
+        return None
+    tree = GraphTree(graph)
+    offsets, targets, labels, goal, keys = graph.offsets, graph.targets, graph.labels, graph.goal, graph.keys
+    rec_v, rec_u, rec_mi = array('i', [s0]), array('i', [-1]), array('h', [-1])
+    visited = bytearray(len(graph))
+    pq = make_queue(queue)
+    pq.push(heuristic(start, spec), 0, 0)
+    while pq:
+        metr.track_frontier(len(pq))
+        h, _, r = pq.pop()
+        u = rec_v[r]
+        if visited[u]:
+            continue
+        visited[u] = 1
+        p = rec_u[r]
+        tree.add(u, p, rec_mi[r], tree.g[p] + 1 if p >= 0 else 0)
+        metr.bump()
+        if goal[u]:
+            return tree.node(u)
+        edges = list(range(offsets[u], offsets[u + 1]))
+        random.shuffle(edges)
+        for e in edges:
+            v = targets[e]
+            if not visited[v]:
+                pq.push(heuristic(keys[v], spec), 0, len(rec_v))
+                rec_v.append(v)
+                rec_u.append(u)
+                rec_mi.append(labels[e])
     return None
 
 def main():
-    optimal = {name: bfs_optimal_length(s) for name,s in TEST_CASES}
+    optimal = optimal_lengths(TEST_CASES)
     while True:
         print(f"\n=== {ALGO_NAME} Menu ===")
         print("1) Choose ONE test case → animate + show metrics")
         print("2) Run ALL test cases (no animation) → summary table")
+        print("3) Benchmark ALL test cases (untraced timing + traced memory) → table + JSON")
+        print("4) Compare heuristics on ALL test cases → expansions saved")
         print("0) Exit")
         sel = input("Select: ").strip()
         if sel == "1":
@@ -43,6 +96,10 @@ def main():
             run_single(greedy_solver, start, ALGO_NAME, animate=True, anim_speed=0.6)
         elif sel == "2":
             run_all_extended(greedy_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1)
+        elif sel == "3":
+            run_all_timed(greedy_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, json_path="bench_greedy.json")
+        elif sel == "4":
+            compare_heuristics(greedy_solver, TEST_CASES)
         elif sel == "0":
             break
         else:
@@ -1,7 +1,18 @@
 #simulated Annealing
 
 import random
-from allItem import StateKey, State, successors, is_goal_key, Metrics, run_single, run_all_extended, bfs_optimal_length
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the batched engine needs NumPy
+    np = None
+
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, State, successors, is_goal_key, Metrics, run_single, run_all_extended, run_all_timed
+from stateGraph import GraphTrace, start_graph
+from retrograde import optimal_lengths
 from data import TEST_CASES
 
 ALGO_NAME = "Simulated Annealing "
@@ -19,17 +30,26 @@ def accept_worse(deltaE: int, T: float) -> bool:
     P = max(0.0, 1.0 - (deltaE / T))
     return random.random() < P
 
-def sa_solver(start: StateKey, metr: Metrics, *, T0: float = 10.0, Tmin: float = 0.1, alpha: float = 0.995, k_max: int = 50000):
+def sa_solver(start: StateKey, metr: Metrics, *, T0: float = 10.0, Tmin: float = 0.1, alpha: float = 0.995, k_max: int = 50000, spec: ProblemSpec = DEFAULT_SPEC, events=None):
+    succ = events.successors if events else successors
     cur = State(start, 0, None, None)
-    best = cur
+    # loop-erased walk: path[i] is the i-th state of the current simple path
+    # and at[key] its position, so revisiting a state cuts the cycle off
+    path = [cur]
+    at = {start: 0}
     T = T0
     k = 0
     while k < k_max and T > Tmin:
-        metr.track_frontier(1)  # SA keeps O(1) states
+        # what SA holds is the loop-erased path (and its at index), not a frontier
+        metr.track_frontier(len(path))
         metr.bump()
+        if events:
+            events.expand(cur)
         if is_goal_key(cur.key):
+            if events:
+                events.goal(cur)
             return cur
-        nbrs = successors(cur, order="random")
+        nbrs = succ(cur, order="random", spec=spec)
         if not nbrs:
             # small reheat
             T = min(T0, T * 1.2)
@@ -37,22 +57,202 @@ def sa_solver(start: StateKey, metr: Metrics, *, T0: float = 10.0, Tmin: float =
             continue
         nxt = random.choice(nbrs)
         dE = energy(nxt.key) - energy(cur.key)
+        if dE <= 0 or accept_worse(dE, T):
+            i = at.get(nxt.key)
+            if i is None:
+                at[nxt.key] = len(path)
+                path.append(nxt)
+                cur = nxt
+            else:
+                for s in path[i + 1:]:
+                    del at[s.key]
+                del path[i + 1:]
+                cur = path[i]
+        elif events:
+            events.prune(nxt)
+        T *= alpha
+        k += 1
+    # the goal may be reached on the very last step
+    if is_goal_key(cur.key):
+        return cur
+    return None
+
+def sa_solver_graph(start: StateKey, metr: Metrics, *, T0: float = 10.0, Tmin: float = 0.1, alpha: float = 0.995, k_max: int = 50000, spec: ProblemSpec = DEFAULT_SPEC):
+    # same loop-erased walk as sa_solver over the precompiled StateGraph
+    graph, s0 = start_graph(start, spec)
+    if s0 is None:
+        return None
+    trace = GraphTrace(graph, s0, loop_erased=True)
+    offsets, targets, labels, goal, keys = graph.offsets, graph.targets, graph.labels, graph.goal, graph.keys
+    cur, pos = s0, 0
+    T = T0
+    k = 0
+    while k < k_max and T > Tmin:
+        metr.track_frontier(pos + 1)   # states on the loop-erased trace
+        metr.bump()
+        if goal[cur]:
+            return trace.node(pos)
+        a, b = offsets[cur], offsets[cur + 1]
+        if a == b:
+            T = min(T0, T * 1.2)
+            k += 1
+            continue
+        e = random.randrange(a, b)
+        nxt = targets[e]
+        dE = energy(keys[nxt]) - energy(keys[cur])
         if dE <= 0 or accept_worse(dE, T):
             cur = nxt
-            if energy(cur.key) < energy(best.key):
-                best = cur
+            pos = trace.step(nxt, labels[e])
         T *= alpha
         k += 1
-    if is_goal_key(best.key):
-        return best
+    if goal[cur]:
+        return trace.node(pos)
     return None
 
+# -------- Batched multi-chain SA (NumPy) --------
+@dataclass
+class BatchResult:
+    """Outcome of one sa_batch call: the shortest loop-erased path any chain
+    ended with, plus per-chain arrays (steps taken, loop-erased path length
+    or -1 if the chain failed)."""
+    goal: object
+    path_len: Optional[int]
+    steps: "np.ndarray"
+    lengths: "np.ndarray"
+
+    @property
+    def successes(self) -> int:
+        return int((self.lengths >= 0).sum())
+
+    @property
+    def chains(self) -> int:
+        return int(self.lengths.size)
+
+    @property
+    def best_length(self) -> Optional[int]:
+        ok = self.lengths[self.lengths >= 0]
+        return int(ok.min()) if ok.size else None
+
+def sa_batch(start: StateKey, *, chains: int = 256, T0: float = 10.0, Tmin: float = 0.1, alpha: float = 0.995, k_max: int = 50000, spec: ProblemSpec = DEFAULT_SPEC, metr: Optional[Metrics] = None, seed=None) -> BatchResult:
+    """Advance `chains` independent sa_solver walks in lock-step.
+
+    Positions, temperatures and step counters are arrays over the chains and
+    every step is one vectorized move proposal + acceptance test with the
+    same energy() / accept_worse() rule and cooling (reheat on dead ends) as
+    sa_solver. A chain stops at the goal, at k_max, or once T <= Tmin.
+    seed=None draws the NumPy seed from `random`, so random.seed() still
+    makes runs repeatable."""
+    if np is None:
+        raise RuntimeError("sa_batch needs NumPy")
+    metr = metr or Metrics()
+    graph, s0 = start_graph(start, spec)
+    if s0 is None:
+        return BatchResult(None, None, np.zeros(chains, dtype=np.int64), np.full(chains, -1, dtype=np.int64))
+    rng = np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+    # NumPy copies of the CSR arrays
+    offsets = np.array(graph.offsets, dtype=np.int64)
+    targets = np.array(graph.targets, dtype=np.int64)
+    goal = np.array(graph.goal, dtype=bool)
+    E = np.array([energy(k) for k in graph.keys], dtype=np.int64)
+    deg = offsets[1:] - offsets[:-1]
+
+    cur = np.full(chains, s0, dtype=np.int64)
+    T = np.full(chains, T0, dtype=np.float64)
+    k = np.zeros(chains, dtype=np.int64)
+    active = np.ones(chains, dtype=bool)
+    # each chain's loop-erased path, as sa_solver's path / at: path[c, :plen[c]]
+    # are its state ids and at[c, v] the position of v. at is never cleared;
+    # an entry counts only if path[c, at[c, v]] == v within plen[c] (a sparse
+    # set), so cutting a cycle is just lowering plen. Zeroed pages are only
+    # touched where a chain goes.
+    size = len(graph)
+    path = np.empty((chains, size), dtype=np.int32)
+    move = np.empty((chains, size), dtype=np.int16)
+    at = np.zeros((chains, size), dtype=np.int32)
+    path[:, 0] = s0
+    plen = np.ones(chains, dtype=np.int64)
+    labels = np.array(graph.labels, dtype=np.int16)
+    while True:
+        # same order as sa_solver: loop condition, count the step, goal test
+        active &= (k < k_max) & (T > Tmin)
+        n = int(active.sum())
+        if n == 0:
+            break
+        metr.track_frontier(n)
+        metr.expanded += n
+        active &= ~goal[cur]
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        u = cur[idx]
+        d = deg[u]
+        # dead ends: small reheat, no move
+        stuck = d == 0
+        T[idx[stuck]] = np.minimum(T0, T[idx[stuck]] * 1.2)
+        live = idx[~stuck]
+        if live.size:
+            u = cur[live]
+            e = offsets[u] + (rng.random(live.size) * deg[u]).astype(np.int64)
+            v = targets[e]
+            dE = E[v] - E[u]
+            Tl = T[live]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                p = np.where(Tl > 1e-9, 1.0 - dE / Tl, 0.0)
+            acc = (dE <= 0) | (rng.random(live.size) < p)
+            took, v, e = live[acc], v[acc], e[acc]
+            cur[took] = v
+            pos = at[took, v]
+            back = (pos < plen[took]) & (path[took, pos] == v)
+            # revisit: cut back to v's position; new state: append it
+            plen[took[back]] = pos[back] + 1
+            fresh, v, e = took[~back], v[~back], e[~back]
+            end = plen[fresh]
+            path[fresh, end] = v
+            move[fresh, end] = labels[e]
+            at[fresh, v] = end
+            plen[fresh] = end + 1
+            T[live] *= alpha
+        k[idx] += 1
+    lengths = np.where(goal[cur], plen - 1, -1)
+    best, best_len = None, None
+    if (lengths >= 0).any():
+        c = int(np.flatnonzero(lengths == lengths[lengths >= 0].min())[0])
+        trace = GraphTrace(graph, s0)
+        for i in range(1, int(plen[c])):
+            trace.step(int(path[c, i]), int(move[c, i]))
+        best_len = int(lengths[c])
+        best = trace.node(best_len)
+    return BatchResult(best, best_len, k, lengths)
+
+def sa_batch_solver(start: StateKey, metr: Metrics, *, chains: int = 256, spec: ProblemSpec = DEFAULT_SPEC, **kw):
+    # solver-shaped wrapper: one call stands in for `chains` sa_solver repeats
+    return sa_batch(start, chains=chains, spec=spec, metr=metr, **kw).goal
+
+def run_all_batched(cases, *, optimal_by_case, chains: int = 256, spec: ProblemSpec = DEFAULT_SPEC):
+    print(f"\n[{ALGO_NAME}] Batched SA, {chains} chains per case")
+    print("\nCase\tSucc\tPath\tTime(s)\tSteps\tMeanPath\tGap\tSuccessRate")
+    rows = []
+    for name, start in cases:
+        t0 = time.perf_counter()
+        res = sa_batch(start, chains=chains, spec=spec)
+        dt = time.perf_counter() - t0
+        ok = res.lengths[res.lengths >= 0]
+        mean = f"{ok.mean():.1f}" if ok.size else None
+        opt = optimal_by_case.get(name)
+        best = res.path_len
+        gap = best - opt if best is not None and opt is not None else None
+        print(f"{name}\t{best is not None}\t{best}\t{dt:.6f}\t{int(res.steps.sum())}\t{mean}\t{gap}\t{res.successes}/{res.chains}")
+        rows.append((name, res))
+    return rows
+
 def main():
-    optimal = {name: bfs_optimal_length(s) for name,s in TEST_CASES}
+    optimal = optimal_lengths(TEST_CASES)
     while True:
         print(f"\n=== {ALGO_NAME} Menu ===")
         print("1) Choose ONE test case → animate + show metrics")
         print("2) Run ALL test cases (no animation) → summary table (best-of-20)")
+        print("3) Benchmark ALL test cases (untraced timing + traced memory) → table + JSON")
+        print("4) Run ALL test cases batched (256 NumPy chains per case) → success-rate table")
         print("0) Exit")
         sel = input("Select: ").strip()
         if sel == "1":
@@ -64,6 +264,10 @@ def main():
         elif sel == "2":
             # SA 重复 20 次以体现成功率与最优差距更可靠
             run_all_extended(lambda st, m: sa_solver(st, m), TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=20)
+        elif sel == "3":
+            run_all_timed(lambda st, m: sa_solver(st, m), TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, json_path="bench_sa.json")
+        elif sel == "4":
+            run_all_batched(TEST_CASES, optimal_by_case=optimal)
         elif sel == "0":
             break
         else:
@@ -1,34 +1,91 @@
 #Breadth-First Search
 
+import os
 from collections import deque
-from allItem import StateKey, State, successors, is_goal_key, Metrics, run_single, run_all_extended, optimal_length_baseline
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, State, successors, is_goal_key, Metrics, run_single, run_all_extended, run_all_timed
+from nodePool import NodePool, pack_key
+from stateGraph import GraphTree, start_graph
+from retrograde import optimal_lengths
+from solveCache import open_cache
 from data import TEST_CASES
 
 ALGO_NAME = "BFS"
 
-def bfs_solver(start: StateKey, metr: Metrics):
+def bfs_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, events=None):
     q = deque()
-    q.append(State(start, 0, None, None))
+    succ, push, pop = successors, q.append, q.popleft
+    if events:
+        succ, push, pop = events.successors, events.timed("queue", q.append), events.timed("queue", q.popleft)
+    push(State(start, 0, None, None))
     visited = set([start])
     while q:
         metr.track_frontier(len(q))
-        u = q.popleft()
+        u = pop()
         metr.bump()
+        if events:
+            events.expand(u)
         if is_goal_key(u.key):
+            if events:
+                events.goal(u)
             return u
-        for v in successors(u, order="deterministic"):
+        for v in succ(u, order="deterministic", spec=spec):
             if v.key not in visited:
                 visited.add(v.key)
+                push(v)
+            elif events:
+                events.prune(v)
+    return None
+
+def bfs_solver_pooled(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC):
+    # same search as bfs_solver, but nodes are slots in a NodePool
+    pool = NodePool(spec)
+    q = deque([pool.add(pack_key(start, spec), -1, -1, 0)])
+    goal = pack_key(StateKey(0, 0, 'R'), spec)
+    while q:
+        metr.track_frontier(len(q))
+        u = q.popleft()
+        metr.bump()
+        if pool.ids[u] == goal:
+            return pool.node(u)
+        gv = pool.g[u] + 1
+        for v, mi in pool.expand(u):
+            if pool.find(v) < 0:
+                q.append(pool.add(v, u, mi, gv))
+    return None
+
+def bfs_solver_graph(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC):
+    # same search as bfs_solver over the precompiled StateGraph
+    graph, s0 = start_graph(start, spec)
+    if s0 is None:
+        return None
+    tree = GraphTree(graph)
+    tree.add(s0, -1, -1, 0)
+    offsets, targets, labels, goal, depth = graph.offsets, graph.targets, graph.labels, graph.goal, tree.g
+    q = deque([s0])
+    while q:
+        metr.track_frontier(len(q))
+        u = q.popleft()
+        metr.bump()
+        if goal[u]:
+            return tree.node(u)
+        gv = depth[u] + 1
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if depth[v] < 0:
+                tree.add(v, u, labels[e], gv)
                 q.append(v)
     return None
 
 def main():
     # precompute optimal lengths for gaps
-    optimal = {name: optimal_length_baseline(s) for name,s in TEST_CASES}
+    optimal = optimal_lengths(TEST_CASES)
+    # memory-only unless SOLVE_CACHE names an sqlite file to keep between runs
+    cache = open_cache(os.environ.get("SOLVE_CACHE"))
     while True:
         print(f"\n=== {ALGO_NAME} Menu ===")
         print("1) Choose ONE test case → animate + show metrics")
         print("2) Run ALL test cases (no animation) → summary table")
+        print("3) Benchmark ALL test cases (untraced timing + traced memory) → table + JSON")
         print("0) Exit")
         sel = input("Select: ").strip()
         if sel == "1":
@@ -36,9 +93,11 @@ def main():
                 print(f"{i}) {name}: start={s}")
             idx = int(input("Pick one: ").strip()) - 1
             name, start = TEST_CASES[idx]
-            run_single(bfs_solver, start, ALGO_NAME, animate=True, anim_speed=0.6)
+            run_single(bfs_solver, start, ALGO_NAME, animate=True, anim_speed=0.6, cache=cache)
         elif sel == "2":
-            run_all_extended(bfs_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1)
+            run_all_extended(bfs_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1, cache=cache)
+        elif sel == "3":
+            run_all_timed(bfs_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, json_path="bench_bfs.json")
         elif sel == "0":
             break
         else:
@@ -1,34 +1,79 @@
 #Depth-First Search
 
-from allItem import StateKey, State, successors, is_goal_key, Metrics, run_single, run_all_extended, bfs_optimal_length
+import random
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, State, successors, is_goal_key, Metrics, run_single, run_all_extended, run_all_timed
+from stateGraph import GraphTree, start_graph
+from retrograde import optimal_lengths
 from data import TEST_CASES
 
 ALGO_NAME = "DFS"
 
-def dfs_solver(start: StateKey, metr: Metrics):
+def dfs_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, events=None):
     stack = [State(start, 0, None, None)]
+    succ, push, pop = successors, stack.append, stack.pop
+    if events:
+        succ, push, pop = events.successors, events.timed("queue", stack.append), events.timed("queue", stack.pop)
     visited = set()
     while stack:
         metr.track_frontier(len(stack))
-        u = stack.pop()
+        u = pop()
         if u.key in visited:
+            if events:
+                events.prune(u)
             continue
         visited.add(u.key)
         metr.bump()
+        if events:
+            events.expand(u)
         if is_goal_key(u.key):
+            if events:
+                events.goal(u)
             return u
         # randomize successors to reveal non-optimality occasionally
-        for v in successors(u, order="random"):
+        for v in succ(u, order="random", spec=spec):
             if v.key not in visited:
+                push(v)
+            elif events:
+                events.prune(v)
+    return None
+
+def dfs_solver_graph(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC):
+    # same search as dfs_solver over the precompiled StateGraph; the newest
+    # push of a state is always popped first, so its parent is set at push time
+    graph, s0 = start_graph(start, spec)
+    if s0 is None:
+        return None
+    tree = GraphTree(graph)
+    tree.add(s0, -1, -1, 0)
+    offsets, targets, labels, goal = graph.offsets, graph.targets, graph.labels, graph.goal
+    visited = bytearray(len(graph))
+    stack = [s0]
+    while stack:
+        metr.track_frontier(len(stack))
+        u = stack.pop()
+        if visited[u]:
+            continue
+        visited[u] = 1
+        metr.bump()
+        if goal[u]:
+            return tree.node(u)
+        gv = tree.g[u] + 1
+        edges = list(range(offsets[u], offsets[u + 1]))
+        random.shuffle(edges)
+        for e in edges:
+            v = targets[e]
+            if not visited[v]:
+                tree.add(v, u, labels[e], gv)
                 stack.append(v)
     return None
 
 def main():
-    optimal = {name: bfs_optimal_length(s) for name,s in TEST_CASES}
+    optimal = optimal_lengths(TEST_CASES)
     while True:
         print(f"\n=== {ALGO_NAME} Menu ===")
         print("1) Choose ONE test case → animate + show metrics")
         print("2) Run ALL test cases (no animation) → summary table")
+        print("3) Benchmark ALL test cases (untraced timing + traced memory) → table + JSON")
         print("0) Exit")
         sel = input("Select: ").strip()
         if sel == "1":
@@ -39,6 +84,8 @@ def main():
             run_single(dfs_solver, start, ALGO_NAME, animate=True, anim_speed=0.6)
         elif sel == "2":
             run_all_extended(dfs_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1)
+        elif sel == "3":
+            run_all_timed(dfs_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, json_path="bench_dfs.json")
         elif sel == "0":
             break
         else:
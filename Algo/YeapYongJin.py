@@ -1,42 +1,119 @@
 #A* Search
 
-import heapq
-from allItem import StateKey, State, successors, is_goal_key, Metrics, heuristic_trips_remaining, run_single, run_all_extended, bfs_optimal_length
+import os
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, State, successors, is_goal_key, Metrics, heuristic_trips_remaining, make_queue, run_single, run_all_extended, run_all_timed
+from nodePool import NodePool, pack_key, unpack_id
+from stateGraph import GraphTree, start_graph
+from heuristics import resolve_heuristic, compare_heuristics
+from retrograde import optimal_lengths
+from solveCache import open_cache
 from data import TEST_CASES
 
 ALGO_NAME = "A*"
 
-def astar_solver(start: StateKey, metr: Metrics):
-    tie = 0
-    openh = []
+def astar_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, heuristic=heuristic_trips_remaining, queue: str = "heap", events=None):
+    heuristic = resolve_heuristic(heuristic, spec)
+    openl = make_queue(queue)
+    succ, push, pop = successors, openl.push, openl.pop
+    if events:
+        succ, push, pop = events.successors, events.timed("queue", openl.push), events.timed("queue", openl.pop)
     start_state = State(start, 0, None, None)
-    heapq.heappush(openh, (heuristic_trips_remaining(start), 0, tie, start_state))
+    push(heuristic(start, spec), 0, start_state)
     gbest = {start: 0}
     closed = set()
-    while openh:
-        metr.track_frontier(len(openh))
-        f, g, _, u = heapq.heappop(openh)
+    while openl:
+        metr.track_frontier(len(openl))
+        f, g, u = pop()
         if u.key in closed:
+            if events:
+                events.prune(u)
             continue
         closed.add(u.key)
         metr.bump()
+        if events:
+            events.expand(u)
         if is_goal_key(u.key):
+            if events:
+                events.goal(u)
             return u
-        for v in successors(u, order="deterministic"):
+        for v in succ(u, order="deterministic", spec=spec):
             gv = v.g
             if (v.key not in gbest) or (gv < gbest[v.key]):
                 gbest[v.key] = gv
-                tie += 1
-                fv = gv + heuristic_trips_remaining(v.key)
-                heapq.heappush(openh, (fv, gv, tie, v))
+                fv = gv + heuristic(v.key, spec)
+                push(fv, gv, v)
+            elif events:
+                events.prune(v)
+    return None
+
+def astar_solver_pooled(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, heuristic=heuristic_trips_remaining, queue: str = "heap"):
+    heuristic = resolve_heuristic(heuristic, spec)
+    # same search as astar_solver; open list holds slots, parents live in a NodePool
+    pool = NodePool(spec)
+    openl = make_queue(queue)
+    openl.push(heuristic(start, spec), 0, pool.add(pack_key(start, spec), -1, -1, 0))
+    goal = pack_key(StateKey(0, 0, 'R'), spec)
+    while openl:
+        metr.track_frontier(len(openl))
+        f, g, u = openl.pop()
+        if pool.closed[u]:
+            continue
+        pool.closed[u] = 1
+        metr.bump()
+        if pool.ids[u] == goal:
+            return pool.node(u)
+        gv = g + 1
+        for v, mi in pool.expand(u):
+            slot = pool.find(v)
+            if slot < 0:
+                slot = pool.add(v, u, mi, gv)
+            elif gv < pool.g[slot]:
+                pool.relink(slot, u, mi, gv)
+            else:
+                continue
+            fv = gv + heuristic(unpack_id(v, spec), spec)
+            openl.push(fv, gv, slot)
+    return None
+
+def astar_solver_graph(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, heuristic=heuristic_trips_remaining, queue: str = "heap"):
+    heuristic = resolve_heuristic(heuristic, spec)
+    # same search as astar_solver over the precompiled StateGraph
+    graph, s0 = start_graph(start, spec)
+    if s0 is None:
+        return None
+    tree = GraphTree(graph)
+    tree.add(s0, -1, -1, 0)
+    offsets, targets, labels, goal, keys, gbest = graph.offsets, graph.targets, graph.labels, graph.goal, graph.keys, tree.g
+    closed = bytearray(len(graph))
+    openl = make_queue(queue)
+    openl.push(heuristic(start, spec), 0, s0)
+    while openl:
+        metr.track_frontier(len(openl))
+        f, g, u = openl.pop()
+        if closed[u]:
+            continue
+        closed[u] = 1
+        metr.bump()
+        if goal[u]:
+            return tree.node(u)
+        gv = g + 1
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if gbest[v] < 0 or gv < gbest[v]:
+                tree.add(v, u, labels[e], gv)
+                openl.push(gv + heuristic(keys[v], spec), gv, v)
     return None
 
 def main():
-    optimal = {name: bfs_optimal_length(s) for name,s in TEST_CASES}
+    optimal = optimal_lengths(TEST_CASES)
+    # memory-only unless SOLVE_CACHE names an sqlite file to keep between runs
+    cache = open_cache(os.environ.get("SOLVE_CACHE"))
     while True:
         print(f"\n=== {ALGO_NAME} Menu ===")
         print("1) Choose ONE test case → animate + show metrics")
         print("2) Run ALL test cases (no animation) → summary table")
+        print("3) Benchmark ALL test cases (untraced timing + traced memory) → table + JSON")
+        print("4) Compare heuristics on ALL test cases → expansions saved")
         print("0) Exit")
         sel = input("Select: ").strip()
         if sel == "1":
@@ -44,9 +121,13 @@ def main():
                 print(f"{i}) {name}: start={s}")
             idx = int(input("Pick one: ").strip()) - 1
             name, start = TEST_CASES[idx]
-            run_single(astar_solver, start, ALGO_NAME, animate=True, anim_speed=0.6)
+            run_single(astar_solver, start, ALGO_NAME, animate=True, anim_speed=0.6, cache=cache)
         elif sel == "2":
-            run_all_extended(astar_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1)
+            run_all_extended(astar_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1, cache=cache)
+        elif sel == "3":
+            run_all_timed(astar_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, json_path="bench_astar.json")
+        elif sel == "4":
+            compare_heuristics(astar_solver, TEST_CASES)
         elif sel == "0":
             break
         else:
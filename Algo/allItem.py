@@ -4,29 +4,53 @@ import random
 import tracemalloc
 import os
 import heapq
+import gc
+import json
+import statistics
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple, Optional, Dict, Set
 
 # -------- ANSI Color Helpers --------
 USE_COLOR = True  # set False to disable coloring
-def _c(text, code):
-    if not USE_COLOR:
-        return text
-    return f"\033[{code}m{text}\033[0m"
 CLR_M = "97"     # bright white for Missionary
 CLR_C = "91"     # red for Cannibal
 CLR_BOAT = "94"  # blue for boat
 CLR_WAVE = "36"  # cyan for river
 CLR_BANK = "90"  # dim for bank labels
 
-# -------- Problem Constants --------
-TOTAL_M = 3
-TOTAL_C = 3
-BOAT_CAPACITY = 2
+# -------- Problem Specification --------
+def build_moves(capacity: int) -> Tuple[Tuple[int,int], ...]:
+    # legal move patterns: (moved_missionaries, moved_cannibals)
+    # 1..capacity people aboard, and missionaries on the boat are never outnumbered
+    out = []
+    for n in range(capacity, 0, -1):
+        for m in range(n, -1, -1):
+            c = n - m
+            if m == 0 or m >= c:
+                out.append((m, c))
+    return tuple(out)
 
-# legal move patterns: (moved_missionaries, moved_cannibals)
-MOVES = [(2,0),(0,2),(1,0),(0,1),(1,1)]
+@dataclass(frozen=True)
+class ProblemSpec:
+    total_m: int = 3
+    total_c: int = 3
+    capacity: int = 2
+    moves: Tuple[Tuple[int,int], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.total_m < 0 or self.total_c < 0 or self.capacity < 1:
+            raise ValueError(f"invalid problem spec: {self.total_m}M/{self.total_c}C, capacity {self.capacity}")
+        # move table is built once per spec, not per successors() call
+        object.__setattr__(self, "moves", build_moves(self.capacity))
+
+DEFAULT_SPEC = ProblemSpec(3, 3, 2)
+
+# -------- Problem Constants (classic 3/3/2 puzzle) --------
+TOTAL_M = DEFAULT_SPEC.total_m
+TOTAL_C = DEFAULT_SPEC.total_c
+BOAT_CAPACITY = DEFAULT_SPEC.capacity
+MOVES = list(DEFAULT_SPEC.moves)
 
 # -------- State Definition --------
 @dataclass(frozen=True)
@@ -43,15 +67,15 @@ class State:
     last_move: Optional[Tuple[int,int,str]] = None  # (m,c,"L→R" or "R→L")
 
 # -------- Validity & Goal --------
-def is_valid_key(k: StateKey) -> bool:
+def is_valid_key(k: StateKey, spec: ProblemSpec = DEFAULT_SPEC) -> bool:
     # bounds
-    if not (0 <= k.m_left <= TOTAL_M and 0 <= k.c_left <= TOTAL_C):
+    if not (0 <= k.m_left <= spec.total_m and 0 <= k.c_left <= spec.total_c):
         return False
     if k.boat not in ('L','R'):
         return False
     # compute right bank
-    m_right = TOTAL_M - k.m_left
-    c_right = TOTAL_C - k.c_left
+    m_right = spec.total_m - k.m_left
+    c_right = spec.total_c - k.c_left
     # safety: missionaries not outnumbered where present
     if k.m_left > 0 and k.c_left > k.m_left:
         return False
@@ -63,18 +87,17 @@ def is_goal_key(k: StateKey) -> bool:
     return k.m_left == 0 and k.c_left == 0 and k.boat == 'R'
 
 # -------- Successor Generation --------
-def successors(s: State, *, order: str = "deterministic") -> List[State]:
+def successors(s: State, *, order: str = "deterministic", spec: ProblemSpec = DEFAULT_SPEC, valid=is_valid_key) -> List[State]:
     out: List[State] = []
-    for m,c in MOVES:
-        if 1 <= m + c <= BOAT_CAPACITY:
-            if s.key.boat == 'L':
-                k2 = StateKey(s.key.m_left - m, s.key.c_left - c, 'R')
-                mv = (m, c, "L→R")
-            else:
-                k2 = StateKey(s.key.m_left + m, s.key.c_left + c, 'L')
-                mv = (m, c, "R→L")
-            if is_valid_key(k2):
-                out.append(State(k2, s.g + 1, s, mv))
+    for m,c in spec.moves:
+        if s.key.boat == 'L':
+            k2 = StateKey(s.key.m_left - m, s.key.c_left - c, 'R')
+            mv = (m, c, "L→R")
+        else:
+            k2 = StateKey(s.key.m_left + m, s.key.c_left + c, 'L')
+            mv = (m, c, "R→L")
+        if valid(k2, spec):
+            out.append(State(k2, s.g + 1, s, mv))
     if order == "deterministic":
         out.sort(key=lambda v: (v.key.m_left, v.key.c_left, v.key.boat))
     elif order == "random":
@@ -82,9 +105,96 @@ def successors(s: State, *, order: str = "deterministic") -> List[State]:
     return out
 
 # -------- Heuristic (admissible & consistent) --------
-def heuristic_trips_remaining(k: StateKey) -> int:
-    # ceil((M_left + C_left)/2)
-    return (k.m_left + k.c_left + 1) // 2
+def heuristic_trips_remaining(k: StateKey, spec: ProblemSpec = DEFAULT_SPEC) -> int:
+    # ceil((M_left + C_left)/capacity); ceil(n/2) for the classic puzzle
+    return (k.m_left + k.c_left + spec.capacity - 1) // spec.capacity
+
+def heuristic_round_trips(k: StateKey, spec: ProblemSpec = DEFAULT_SPEC) -> int:
+    # every crossing back needs a rower, so each round trip before the last
+    # forward trip moves at most capacity-1 people net; with the boat on the
+    # right someone has to row it back first (n+1 on the left, one extra trip)
+    n = k.m_left + k.c_left
+    if n == 0:
+        return 0
+    cap = spec.capacity
+    extra = 0
+    if k.boat == 'R':
+        n, extra = n + 1, 1
+    if n <= cap or cap < 2:
+        return extra + 1
+    # ceil((n - cap) / (cap - 1)) round trips, then the last forward trip
+    return extra + 2 * ((n - 2) // (cap - 1)) + 1
+
+# -------- Priority Queues (open lists for A* / greedy) --------
+class HeapQueue:
+    """heapq open list; pops by (p1, p2) then insertion order."""
+    def __init__(self):
+        self._h = []
+        self._tie = 0
+    def __len__(self) -> int:
+        return len(self._h)
+    def push(self, p1: int, p2: int, item):
+        heapq.heappush(self._h, (p1, p2, self._tie, item))
+        self._tie += 1
+    def pop(self):
+        p1, p2, _, item = heapq.heappop(self._h)
+        return p1, p2, item
+
+class BucketQueue:
+    """Dial-style bucket queue for small non-negative integer priorities.
+    Same pop order as HeapQueue: rows[p1] maps p2 to a FIFO deque, a cursor
+    tracks the lowest possibly non-empty row (pushing below it just moves it
+    back), and each row keeps its few distinct p2 keys in a tiny heap.
+    Push is O(1) unless it opens a new p2 key in a row."""
+    def __init__(self):
+        self._rows: List[Dict[int, deque]] = []  # p1 -> {p2: FIFO}
+        self._keys: List[List[int]] = []         # p1 -> heap of p2 keys present in the row
+        self._count: List[int] = []              # p1 -> items in that row
+        self._lo = 0
+        self._n = 0
+    def __len__(self) -> int:
+        return self._n
+    def push(self, p1: int, p2: int, item):
+        if p1 >= len(self._rows):
+            grow = p1 + 1 - len(self._rows)
+            self._rows.extend({} for _ in range(grow))
+            self._keys.extend([] for _ in range(grow))
+            self._count.extend([0] * grow)
+        row = self._rows[p1]
+        b = row.get(p2)
+        if b is None:
+            b = row[p2] = deque()
+            heapq.heappush(self._keys[p1], p2)
+        b.append(item)
+        self._count[p1] += 1
+        if p1 < self._lo or self._n == 0:
+            self._lo = p1
+        self._n += 1
+    def pop(self):
+        if self._n == 0:
+            raise IndexError("pop from empty BucketQueue")
+        i = self._lo
+        while self._count[i] == 0:
+            i += 1
+        self._lo = i
+        row, keys = self._rows[i], self._keys[i]
+        j = keys[0]
+        b = row[j]
+        item = b.popleft()
+        if not b:
+            heapq.heappop(keys)
+            del row[j]
+        self._count[i] -= 1
+        self._n -= 1
+        return i, j, item
+
+def make_queue(kind: str = "heap"):
+    """Open list by name: "heap" (heapq) or "bucket" (integer bucket queue)."""
+    if kind == "heap":
+        return HeapQueue()
+    if kind == "bucket":
+        return BucketQueue()
+    raise ValueError(f"unknown queue kind: {kind!r}")
 
 # -------- Metrics --------
 class Metrics:
@@ -92,6 +202,7 @@ class Metrics:
         self.expanded = 0
         self.max_frontier = 0
         self.peak_mem_kb = 0
+        self.parts: Dict[str, "Metrics"] = {}  # optional per-direction / per-phase breakdown
     def bump(self):
         self.expanded += 1
     def track_frontier(self, n: int):
@@ -103,74 +214,26 @@ class Metrics:
         if pk > self.peak_mem_kb:
             self.peak_mem_kb = pk
 
-# -------- ASCII Rendering Helpers --------
-def _render_banks(k: StateKey) -> Tuple[str, str]:
-    left_people = _c("M"*k.m_left, CLR_M) + (" " if k.m_left and k.c_left else "") + _c("C"*k.c_left, CLR_C)
-    right_people = _c("M"*(TOTAL_M - k.m_left), CLR_M) + (" " if (TOTAL_M-k.m_left) and (TOTAL_C-k.c_left) else "") + _c("C"*(TOTAL_C - k.c_left), CLR_C)
-    left = _c("L | ", CLR_BANK) + left_people
-    right = right_people + _c(" | R", CLR_BANK)
-    return left, right
-
-def _render_scene(k: StateKey, boat_pos: int, m_on_boat: int, c_on_boat: int, width: int = 28) -> str:
-    waves_raw = "~"*width
-    boat_load = ("M"*m_on_boat + "C"*c_on_boat) or " "
-    boat = _c(f"[{boat_load:2s}]", CLR_BOAT)
-    boat_pos = max(0, min(len(waves_raw)-3, boat_pos))
-    river_colored = _c(waves_raw[:boat_pos], CLR_WAVE) + boat + _c(waves_raw[boat_pos+3:], CLR_WAVE)
-    left, right = _render_banks(k)
-    return f"{left}\n{river_colored}\n{right}\n"
-
 # -------- Animation (ASCII river + moving boat) --------
-def play_animation(goal_state: Optional[State], *, speed: float = 0.6):
-    if goal_state is None:
-        print("\nNo solution to animate.\n")
-        return
-    # Reconstruct path
-    path = []
-    s = goal_state
-    while s is not None:
-        path.append(s)
-        s = s.parent
-    path.reverse()
-
-    print("\n--- Animation (ASCII river with moving boat) ---")
-    width = 28
-    for i, st in enumerate(path):
-        k = st.key
-        m_on_boat, c_on_boat = (0, 0)
-        direction = None
-        if st.last_move:
-            m_on_boat, c_on_boat, direction = st.last_move
-
-        # travel phase between previous state and current state
-        if i > 0 and direction:
-            if direction == "L→R":
-                for x in range(0, width-2, 3):
-                    frame = _render_scene(StateKey(path[i-1].key.m_left - m_on_boat, path[i-1].key.c_left - c_on_boat, 'R'), x, m_on_boat, c_on_boat, width)
-                    print(frame, end="")
-                    time.sleep(max(0.04, speed/7))
-                    print("\033[3A", end="")  # move cursor up to overwrite 3 lines
-            else:
-                for x in range(width-3, -1, -3):
-                    frame = _render_scene(StateKey(path[i-1].key.m_left + m_on_boat, path[i-1].key.c_left + c_on_boat, 'L'), x, m_on_boat, c_on_boat, width)
-                    print(frame, end="")
-                    time.sleep(max(0.04, speed/7))
-                    print("\033[3A", end="")
-
-        # landed frame
-        frame = _render_scene(k, 0 if k.boat=='L' else width-3, 0, 0, width)
-        print(frame, end="")
-        mR = TOTAL_M - k.m_left
-        cR = TOTAL_C - k.c_left
-        step_info = f"Step {i:02d}  move: {m_on_boat}M {c_on_boat}C {direction or ''}    Left(M={k.m_left},C={k.c_left})  Right(M={mR},C={cR})"
-        print(step_info + "\n")
-        time.sleep(speed)
-    print("--- End Animation ---\n")
+def play_animation(goal_state: Optional[State], *, speed: float = 0.6, spec: ProblemSpec = DEFAULT_SPEC, instant: bool = False, out=None):
+    """Play the path to goal_state (any reconstruct_path handle). Frames are
+    precomputed by animation.path_frames and written one write each;
+    instant=True drops the pauses. When `out` (default stdout) isn't a
+    terminal, a plain transcript of the landed steps is written instead."""
+    import sys
+    from animation import path_frames, play   # lazy: animation imports allItem
+    out = out or sys.stdout
+    tty = out.isatty() if hasattr(out, "isatty") else False
+    frames = path_frames(reconstruct_path(goal_state), spec=spec, speed=speed, travel=tty, color=USE_COLOR and tty)
+    play(frames, out=out, instant=instant or not tty)
 
 # -------- Path Reconstruction --------
-def reconstruct_path(goal: Optional[State]) -> List[StateKey]:
+def reconstruct_path(goal) -> List[StateKey]:
     if goal is None:
         return []
+    if getattr(goal, "pool", None) is not None:
+        # NodePool handle: walk the parent array
+        return goal.pool.path_keys(goal.slot)
     seq = []
     s = goal
     while s:
@@ -180,92 +243,244 @@ def reconstruct_path(goal: Optional[State]) -> List[StateKey]:
     return seq
 
 
-def optimal_length_baseline(start: StateKey) -> Optional[int]:
+def optimal_length_baseline(start: StateKey, spec: ProblemSpec = DEFAULT_SPEC, *, queue: str = "heap") -> Optional[int]:
     """Compute the optimal boat-trip length from start to goal using A*.
-    Uses h(n)=ceil((M_left+C_left)/2), which is admissible & consistent.
+    Uses h(n)=ceil((M_left+C_left)/capacity), which is admissible & consistent.
     This function is algorithm-neutral and used only to compute the ground-truth
     optimal length for reporting the Optimality Gap."""
     start_state = State(start, 0, None, None)
-    openh = []
-    tie = 0
+    openl = make_queue(queue)
     def h(k: StateKey) -> int:
-        return (k.m_left + k.c_left + 1) // 2  # same as heuristic_trips_remaining
-    heapq.heappush(openh, (h(start), 0, tie, start_state))
+        return heuristic_trips_remaining(k, spec)
+    openl.push(h(start), 0, start_state)
     gbest: Dict[StateKey, int] = {start: 0}
     closed: Set[StateKey] = set()
-    while openh:
-        f, g, _, u = heapq.heappop(openh)
+    while openl:
+        f, g, u = openl.pop()
         if u.key in closed:
             continue
         closed.add(u.key)
         if is_goal_key(u.key):
             return u.g
-        for v in successors(u, order="deterministic"):
+        for v in successors(u, order="deterministic", spec=spec):
             gv = v.g  # each move costs 1 boat trip
             if (v.key not in gbest) or (gv < gbest[v.key]):
                 gbest[v.key] = gv
-                tie += 1
-                heapq.heappush(openh, (gv + h(v.key), gv, tie, v))
+                openl.push(gv + h(v.key), gv, v)
     return None
 
 # -------- Runner Utilities --------
-def run_single(solver_fn, start: StateKey, algo_name: str, *, animate: bool = True, anim_speed: float = 0.6):
+def _call_solver(solver_fn, start: StateKey, metr: Metrics, spec: Optional[ProblemSpec], events=None):
+    # plain (start, metr) solvers keep working when no spec / events are requested
+    kw = {}
+    if spec is not None:
+        kw["spec"] = spec
+    if events is not None:
+        kw["events"] = events
+    return solver_fn(start, metr, **kw)
+
+def _print_single(algo_name: str, start: StateKey, res: dict, cached: bool = False):
+    print(f"\n[{algo_name}] Single-case result" + (" (cached)" if cached else ""))
+    print("Start:", start, "Goal:", (0,0,'R'))
+    print(f"Success: {res['success']}  PathLen(boat trips): {res['path_len']}  Time(s): {res['time']:.6f}  Expanded: {res['expanded']}  MaxFrontier: {res['frontier']}  PeakKB: {res['peak_kb']}")
+    for part, pm in res["parts"].items():
+        print(f"  {part}: Expanded: {pm['expanded']}  MaxFrontier: {pm['frontier']}")
+
+def run_single(solver_fn, start: StateKey, algo_name: str, *, animate: bool = True, anim_speed: float = 0.6, spec: Optional[ProblemSpec] = None, events=None, cache=None, seed=None):
+    """Solve one start state, print its metrics and optionally animate it.
+
+    seed, if given, reseeds `random` first. cache (a solveCache.SolveCache)
+    returns a stored result + path for a (spec, start, solver[, seed]) seen
+    before, flagged "cached": its time and peak KB are from the run that
+    stored it. Instrumented runs (events) always solve."""
+    key = cache.key(solver_fn, start, spec, seed) if cache is not None and events is None else None
+    hit = cache.get(key) if key is not None else None
+    if hit is not None:
+        res, path = hit
+        res = dict(res, cached=True)
+        _print_single(algo_name, start, res, cached=True)
+        if animate and path:
+            from nodePool import KeyPath
+            play_animation(KeyPath(path).node(len(path) - 1), speed=anim_speed, spec=spec or DEFAULT_SPEC)
+        return res
+    if seed is not None:
+        random.seed(seed)
     metr = Metrics()
     # time and memory
     tracemalloc.start()
-    t0 = time.perf_counter()
-    goal = solver_fn(start, metr)
-    t1 = time.perf_counter()
-    metr.track_memory()
-    tracemalloc.stop()
+    try:
+        t0 = time.perf_counter()
+        goal = _call_solver(solver_fn, start, metr, spec, events)
+        t1 = time.perf_counter()
+        metr.track_memory()
+    finally:
+        tracemalloc.stop()
     # results
+    path = reconstruct_path(goal)
     if goal:
-        path = reconstruct_path(goal)
         path_len = max(0, len(path) - 1)
         success = True
     else:
         path_len = None
         success = False
+    res = {"success": success, "path_len": path_len, "time": t1 - t0, "expanded": metr.expanded, "frontier": metr.max_frontier, "peak_kb": metr.peak_mem_kb, "parts": {part: {"expanded": pm.expanded, "frontier": pm.max_frontier} for part, pm in metr.parts.items()}}
     # show
-    print(f"\n[{algo_name}] Single-case result")
-    print("Start:", start, "Goal:", (0,0,'R'))
-    print(f"Success: {success}  PathLen(boat trips): {path_len}  Time(s): {t1 - t0:.6f}  Expanded: {metr.expanded}  MaxFrontier: {metr.max_frontier}  PeakKB: {metr.peak_mem_kb}")
+    _print_single(algo_name, start, res)
     if animate:
-        play_animation(goal, speed=anim_speed)
-    return {"success": success, "path_len": path_len, "time": t1 - t0, "expanded": metr.expanded, "frontier": metr.max_frontier, "peak_kb": metr.peak_mem_kb}
+        play_animation(goal, speed=anim_speed, spec=spec or DEFAULT_SPEC)
+    if key is not None:
+        cache.put(key, res, path)
+    return res
 
-def run_all_extended(solver_fn, cases: List[Tuple[str, StateKey]], *, algo_name: str, optimal_by_case: Dict[str, Optional[int]], repeats:int=1):
+def summarize_case(name: str, results: List[dict], opt: Optional[int]):
+    """Fold the run_single results of one case into a summary-table row;
+    its last field counts the results that came from a cache."""
+    best = None
+    success_count = 0
+    accum_time = 0.0
+    accum_expanded = 0
+    accum_frontier = 0
+    accum_peak = 0
+    cached = 0
+    for res in results:
+        cached += bool(res.get("cached"))
+        if res["success"]:
+            success_count += 1
+            if (best is None) or (res["path_len"] < best["path_len"]):
+                best = res
+        accum_time += res["time"]
+        accum_expanded += res["expanded"]
+        accum_frontier += res["frontier"]
+        accum_peak += res["peak_kb"]
+    repeats = len(results)
+    avg_time = accum_time / repeats
+    avg_exp = accum_expanded // repeats
+    avg_frontier = accum_frontier // repeats
+    avg_peak = accum_peak // repeats
+    gap = None
+    if best and opt is not None:
+        gap = best["path_len"] - opt
+    return (name, best["success"] if best else False, best["path_len"] if best else None, avg_time, avg_exp, avg_frontier, avg_peak, gap, success_count, repeats, cached)
+
+def print_summary(rows):
+    print("\nCase\tSucc\tPath\tTime(s)\tExpanded\tFrontier\tPeakKB\tGap\tSuccessRate")
+    for (name, succ, plen, at, ae, af, ap, gap, sc, rep, cached) in rows:
+        rate = f"{sc}/{rep}"
+        mark = "*" if cached else ""
+        print(f"{name}{mark}\t{succ}\t{plen}\t{at:.6f}\t{ae}\t\t{af}\t\t{ap}\t{gap}\t{rate}")
+    if any(row[-1] for row in rows):
+        print("* includes cached results: their Time and PeakKB were measured when they were stored")
+
+def default_optimal(cases: List[Tuple[str, StateKey]], spec: Optional[ProblemSpec] = None) -> Dict[str, Optional[int]]:
+    # Gap column from the retrograde distance table (one reverse BFS per spec)
+    from retrograde import optimal_lengths
+    return optimal_lengths(cases, spec or DEFAULT_SPEC)
+
+def run_all_extended(solver_fn, cases: List[Tuple[str, StateKey]], *, algo_name: str, optimal_by_case: Optional[Dict[str, Optional[int]]] = None, repeats:int=1, spec: Optional[ProblemSpec] = None, cache=None, seed=None):
+    if optimal_by_case is None:
+        optimal_by_case = default_optimal(cases, spec)
     rows = []
     print(f"\n[{algo_name}] Run ALL test cases (repeats={repeats})")
     for name, start in cases:
-        best = None
-        success_count = 0
-        accum_time = 0.0
-        accum_expanded = 0
-        accum_frontier = 0
-        accum_peak = 0
-        for r in range(repeats):
-            res = run_single(solver_fn, start, algo_name, animate=False)
-            if res["success"]:
-                success_count += 1
-                if (best is None) or (res["path_len"] < best["path_len"]):
-                    best = res
-            accum_time += res["time"]
-            accum_expanded += res["expanded"]
-            accum_frontier += res["frontier"]
-            accum_peak += res["peak_kb"]
-        avg_time = accum_time / repeats
-        avg_exp = accum_expanded // repeats
-        avg_frontier = accum_frontier // repeats
-        avg_peak = accum_peak // repeats
-        opt = optimal_by_case.get(name)
-        gap = None
-        if best and opt is not None:
-            gap = best["path_len"] - opt
-        rows.append((name, best["success"] if best else False, best["path_len"] if best else None, avg_time, avg_exp, avg_frontier, avg_peak, gap, success_count, repeats))
+        # with a seed, every (case, repeat) gets its own reproducible stream
+        results = [run_single(solver_fn, start, algo_name, animate=False, spec=spec, cache=cache, seed=None if seed is None else f"{seed}/{name}/{r}") for r in range(repeats)]
+        rows.append(summarize_case(name, results, optimal_by_case.get(name)))
     # print table
-    print("\nCase\tSucc\tPath\tTime(s)\tExpanded\tFrontier\tPeakKB\tGap\tSuccessRate")
-    for (name, succ, plen, at, ae, af, ap, gap, sc, rep) in rows:
-        rate = f"{sc}/{rep}"
-        print(f"{name}\t{succ}\t{plen}\t{at:.6f}\t{ae}\t\t{af}\t\t{ap}\t{gap}\t{rate}")
+    print_summary(rows)
     return rows
+
+# -------- Benchmark Mode (timing and memory in separate passes) --------
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    # nearest-rank percentile of an already sorted list
+    idx = max(0, math.ceil(q * len(sorted_vals)) - 1)
+    return sorted_vals[idx]
+
+def measure_single(solver_fn, start: StateKey, *, iterations: int = 20, warmup: int = 2, spec: Optional[ProblemSpec] = None, keep_times: bool = False) -> dict:
+    """Benchmark one start state without tracemalloc skewing the clock.
+
+    `warmup` untimed runs, then `iterations` timed runs with tracemalloc off
+    (and GC paused, as timeit does) for median / p95 / stddev, then one
+    separate traced run that only reports peak memory. keep_times=True adds
+    the sorted per-iteration times (for significance tests)."""
+    for _ in range(warmup):
+        _call_solver(solver_fn, start, Metrics(), spec)
+    times = []
+    successes = 0
+    best_len = None
+    expanded = []
+    frontier = []
+    for _ in range(iterations):
+        metr = Metrics()
+        gc_was_on = gc.isenabled()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            goal = _call_solver(solver_fn, start, metr, spec)
+            t1 = time.perf_counter()
+        finally:
+            if gc_was_on:
+                gc.enable()
+        times.append(t1 - t0)
+        expanded.append(metr.expanded)
+        frontier.append(metr.max_frontier)
+        if goal:
+            successes += 1
+            plen = max(0, len(reconstruct_path(goal)) - 1)
+            if best_len is None or plen < best_len:
+                best_len = plen
+    # memory pass
+    metr = Metrics()
+    tracemalloc.start()
+    try:
+        _call_solver(solver_fn, start, metr, spec)
+        metr.track_memory()
+    finally:
+        # a solver raising here must not leave later timings traced
+        tracemalloc.stop()
+    times.sort()
+    res = {
+        "success": successes > 0,
+        "path_len": best_len,
+        "iterations": iterations,
+        "successes": successes,
+        "time_median": statistics.median(times),
+        "time_p95": _percentile(times, 0.95),
+        "time_stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "time_min": times[0],
+        "expanded": int(statistics.median(expanded)),
+        "frontier": int(statistics.median(frontier)),
+        "peak_kb": metr.peak_mem_kb,
+    }
+    if keep_times:
+        res["times"] = times
+    return res
+
+def run_all_timed(solver_fn, cases: List[Tuple[str, StateKey]], *, algo_name: str, optimal_by_case: Optional[Dict[str, Optional[int]]] = None, iterations: int = 20, warmup: int = 2, spec: Optional[ProblemSpec] = None, json_path: Optional[str] = None):
+    """Benchmark counterpart of run_all_extended: prints a tab table and,
+    if json_path is given, writes the same records as JSON."""
+    if optimal_by_case is None:
+        optimal_by_case = default_optimal(cases, spec)
+    sp = spec or DEFAULT_SPEC
+    print(f"\n[{algo_name}] Benchmark ALL test cases (iterations={iterations}, warmup={warmup})")
+    records = []
+    for name, start in cases:
+        res = measure_single(solver_fn, start, iterations=iterations, warmup=warmup, spec=spec)
+        opt = optimal_by_case.get(name)
+        gap = res["path_len"] - opt if (res["success"] and opt is not None) else None
+        records.append(dict(res, case=name, start=[start.m_left, start.c_left, start.boat], optimal=opt, gap=gap))
+    print("\nCase\tSucc\tPath\tMedian(s)\tP95(s)\tStd(s)\tExpanded\tFrontier\tPeakKB\tGap\tSuccessRate")
+    for r in records:
+        rate = f"{r['successes']}/{r['iterations']}"
+        print(f"{r['case']}\t{r['success']}\t{r['path_len']}\t{r['time_median']:.6f}\t{r['time_p95']:.6f}\t{r['time_stdev']:.6f}\t{r['expanded']}\t\t{r['frontier']}\t\t{r['peak_kb']}\t{r['gap']}\t{rate}")
+    if json_path:
+        doc = {
+            "algo": algo_name,
+            "spec": {"total_m": sp.total_m, "total_c": sp.total_c, "capacity": sp.capacity},
+            "iterations": iterations,
+            "warmup": warmup,
+            "cases": records,
+        }
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print(f"Wrote {json_path}")
+    return records
@@ -0,0 +1,158 @@
+# Buffered animation renderer: frames are built once for a whole path, then
+# played to a terminal, dumped without sleeps, or exported (text / asciicast)
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional, TextIO, Tuple
+import allItem
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, CLR_M, CLR_C, CLR_BOAT, CLR_WAVE, CLR_BANK
+
+# A frame is (text, hold): text is written in one call, cursor controls
+# included, and the player waits `hold` seconds before the next one.
+Frame = Tuple[str, float]
+
+HEADER = "\n--- Animation (ASCII river with moving boat) ---\n"
+FOOTER = "--- End Animation ---\n\n"
+NO_SOLUTION = "\nNo solution to animate.\n\n"
+UP3 = "\033[3A"   # back over the three scene lines of a travel frame
+LETTERS_MAX = 12  # banks of bigger specs show counts instead of one letter per person
+
+def _paint(text: str, code: str, color: bool) -> str:
+    return f"\033[{code}m{text}\033[0m" if color else text
+
+class _Scene:
+    """Cached pieces of the three scene lines (left bank, river with boat,
+    right bank) for one spec, so a frame is a join of ready-made strings."""
+
+    def __init__(self, spec: ProblemSpec, width: int, color: bool):
+        self.spec = spec
+        self.width = width
+        self.color = color
+        self.letters = spec.total_m <= LETTERS_MAX and spec.total_c <= LETTERS_MAX
+        self._rivers: Dict[Tuple[int, int, int], str] = {}
+        self._left = _paint("L | ", CLR_BANK, color)
+        self._right = _paint(" | R", CLR_BANK, color)
+
+    def _people(self, m: int, c: int) -> str:
+        if self.letters:
+            ms, cs = "M" * m, "C" * c
+        else:
+            ms, cs = (f"M×{m}" if m else ""), (f"C×{c}" if c else "")
+        return _paint(ms, CLR_M, self.color) + (" " if m and c else "") + _paint(cs, CLR_C, self.color)
+
+    def banks(self, k: StateKey) -> Tuple[str, str]:
+        mR, cR = self.spec.total_m - k.m_left, self.spec.total_c - k.c_left
+        return self._left + self._people(k.m_left, k.c_left), self._people(mR, cR) + self._right
+
+    def river(self, pos: int, m: int, c: int) -> str:
+        key = (pos, m, c)
+        r = self._rivers.get(key)
+        if r is None:
+            waves = "~" * self.width
+            boat = _paint(f"[{('M' * m + 'C' * c) or ' ':2s}]", CLR_BOAT, self.color)
+            pos = max(0, min(self.width - 3, pos))
+            r = self._rivers[key] = _paint(waves[:pos], CLR_WAVE, self.color) + boat + _paint(waves[pos + 3:], CLR_WAVE, self.color)
+        return r
+
+def path_frames(keys: List[StateKey], *, spec: ProblemSpec = DEFAULT_SPEC, speed: float = 0.6, width: int = 28, travel: bool = True, color: Optional[bool] = None) -> List[Frame]:
+    """All frames of play_animation for a path of keys, in order.
+
+    travel=False keeps only the landed scenes and step lines (what is left
+    on screen after each step), without cursor controls: a plain transcript.
+    color defaults to allItem.USE_COLOR."""
+    if not keys:
+        return [(NO_SOLUTION, 0.0)]
+    scene = _Scene(spec, width, allItem.USE_COLOR if color is None else color)
+    hop = max(0.04, speed / 7)
+    right_dock = width - 3
+    frames: List[Frame] = [(HEADER, 0.0)]
+    prev = None
+    for i, k in enumerate(keys):
+        left, right = scene.banks(k)
+        dm = dc = 0
+        direction = ""
+        if prev is not None:
+            dm, dc = abs(prev.m_left - k.m_left), abs(prev.c_left - k.c_left)
+            direction = "L→R" if prev.boat == 'L' else "R→L"
+            if travel:
+                xs = range(0, width - 2, 3) if direction == "L→R" else range(width - 3, -1, -3)
+                for x in xs:
+                    frames.append((f"{left}\n{scene.river(x, dm, dc)}\n{right}\n{UP3}", hop))
+        mR, cR = spec.total_m - k.m_left, spec.total_c - k.c_left
+        landed = scene.river(0 if k.boat == 'L' else right_dock, 0, 0)
+        frames.append((f"{left}\n{landed}\n{right}\nStep {i:02d}  move: {dm}M {dc}C {direction}    Left(M={k.m_left},C={k.c_left})  Right(M={mR},C={cR})\n\n", speed))
+        prev = k
+    frames.append((FOOTER, 0.0))
+    return frames
+
+# -------- Output --------
+def play(frames: List[Frame], *, out: Optional[TextIO] = None, instant: bool = False):
+    """Write each frame with a single write + flush; instant skips the
+    holds, so the whole animation is one burst of writes."""
+    out = out or sys.stdout
+    for text, hold in frames:
+        out.write(text)
+        out.flush()
+        if hold and not instant:
+            time.sleep(hold)
+
+def export_text(frames: List[Frame], path: str):
+    # meant for path_frames(..., travel=False, color=False)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(text for text, _ in frames))
+
+def export_asciicast(frames: List[Frame], path: str, *, width: int = 80, height: int = 24, title: Optional[str] = None):
+    """asciicast v2 (asciinema play / the web player): a header line, then
+    one [time, "o", text] event per frame at its cumulative hold time."""
+    header = {"version": 2, "width": width, "height": height, "timestamp": int(time.time()), "env": {"TERM": "xterm-256color"}}
+    if title:
+        header["title"] = title
+    t = 0.0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n")
+        for text, hold in frames:
+            # recorded output comes from a tty, which turns \n into \r\n
+            f.write(json.dumps([round(t, 6), "o", text.replace("\n", "\r\n")], ensure_ascii=False) + "\n")
+            t += hold
+
+def main():
+    from batchSolve import SOLVERS, solve_one, _key
+    ap = argparse.ArgumentParser(description="Solve one start state and play or export its animation.")
+    ap.add_argument("--m", type=int, default=DEFAULT_SPEC.total_m, help="total missionaries")
+    ap.add_argument("--c", type=int, default=DEFAULT_SPEC.total_c, help="total cannibals")
+    ap.add_argument("--capacity", type=int, default=DEFAULT_SPEC.capacity, help="boat capacity")
+    ap.add_argument("--start", nargs=3, default=None, metavar=("M_LEFT", "C_LEFT", "BOAT"), help="default: everyone on the left bank")
+    ap.add_argument("-a", "--algo", default="retrograde", help=f"one of: {', '.join(SOLVERS)}")
+    ap.add_argument("-o", "--output", default=None, help="write to a file instead of playing: .cast = asciicast v2, anything else = plain text")
+    ap.add_argument("--speed", type=float, default=0.6, help="seconds per landed step")
+    ap.add_argument("--instant", action="store_true", help="play without pauses")
+    args = ap.parse_args()
+    if args.algo not in SOLVERS:
+        ap.error(f"unknown solver {args.algo!r}")
+    spec = ProblemSpec(args.m, args.c, args.capacity)
+    try:
+        start = _key(*args.start) if args.start else StateKey(spec.total_m, spec.total_c, 'L')
+    except ValueError as e:
+        ap.error(f"bad --start: {e}")
+    _, keys = solve_one(SOLVERS[args.algo], start, spec=spec)
+    t0 = time.perf_counter()
+    if args.output and args.output.endswith(".cast"):
+        frames = path_frames(keys, spec=spec, speed=args.speed, color=True)
+        # widest lines are the full banks at either end; measure them uncoloured
+        ends = path_frames(keys[:1] + keys[-1:], spec=spec, travel=False, color=False)
+        width = max(len(line) for text, _ in ends for line in text.split("\n"))
+        export_asciicast(frames, args.output, width=max(width, 80), height=24, title=f"{args.algo} {spec.total_m}/{spec.total_c}/{spec.capacity} from {start}")
+    elif args.output:
+        frames = path_frames(keys, spec=spec, speed=args.speed, travel=False, color=False)
+        export_text(frames, args.output)
+    else:
+        # as play_animation: piped output gets the plain transcript at once
+        tty = sys.stdout.isatty()
+        play(path_frames(keys, spec=spec, speed=args.speed, travel=tty, color=allItem.USE_COLOR and tty), instant=args.instant or not tty)
+        return
+    print(f"wrote {args.output}: {max(0, len(keys) - 1)} steps, {len(frames)} frames in {time.perf_counter() - t0:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# Headless batch solver: start states in (CSV / JSONL), JSONL results out
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, Metrics, reconstruct_path, _call_solver
+from retrograde import get_distance_table, retrograde_solver
+from solveCache import open_cache
+import StephanieLo, VictorYangMingHan, YeapYongJin, ChanYiHerng, HamGuanQuan
+import bidirBFS, vectorBFS, boundedSearch, closedForm
+
+# name -> solver(start, metr, *, spec)
+SOLVERS = {
+    "bfs": StephanieLo.bfs_solver,
+    "bfs-pooled": StephanieLo.bfs_solver_pooled,
+    "bfs-graph": StephanieLo.bfs_solver_graph,
+    "dfs": VictorYangMingHan.dfs_solver,
+    "astar": YeapYongJin.astar_solver,
+    "astar-graph": YeapYongJin.astar_solver_graph,
+    "greedy": ChanYiHerng.greedy_solver,
+    "sa": HamGuanQuan.sa_solver,
+    "sa-batch": HamGuanQuan.sa_batch_solver,
+    "bidir": bidirBFS.bidir_bfs_solver,
+    "vector-bfs": vectorBFS.vector_bfs_solver,
+    "ida": boundedSearch.ida_star_solver,
+    "frontier-bfs": boundedSearch.frontier_bfs_solver,
+    "retrograde": retrograde_solver,
+    "closed-form": closedForm.closed_form_solver,
+}
+
+# -------- Input --------
+def _key(m, c, boat) -> StateKey:
+    boat = str(boat).strip().upper()
+    if boat not in ("L", "R"):
+        raise ValueError(f"boat must be L or R, got {boat!r}")
+    return StateKey(int(m), int(c), boat)
+
+def read_starts(stream: TextIO, fmt: str = "auto") -> Iterator[Tuple[str, object]]:
+    """Yield (id, StateKey) per input record, or (id, error message) for a
+    record that can't be parsed; ids default to the 1-based record number.
+
+    csv:   m_left,c_left,boat[,id] per line; a header row naming those
+           columns is optional
+    jsonl: {"m_left": .., "c_left": .., "boat": .., "id": ..} or
+           {"start": [m, c, boat], "id": ..} per line
+    auto:  jsonl if the first non-blank character is '{', csv otherwise"""
+    if fmt == "auto":
+        first = ""
+        for first in stream:
+            if first.strip():
+                break
+        fmt = "jsonl" if first.lstrip().startswith("{") else "csv"
+        stream = _chain_line(first, stream)
+    if fmt == "jsonl":
+        yield from _read_jsonl(stream)
+    elif fmt == "csv":
+        yield from _read_csv(stream)
+    else:
+        raise ValueError(f"unknown input format {fmt!r}")
+
+def _chain_line(first: str, stream: Iterable[str]) -> Iterator[str]:
+    if first:
+        yield first
+    yield from stream
+
+def _read_jsonl(lines: Iterable[str]) -> Iterator[Tuple[str, object]]:
+    n = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        n += 1
+        try:
+            rec = json.loads(line)
+            rid = str(rec.get("id", n))
+        except (ValueError, AttributeError) as e:
+            yield str(n), f"bad record: {e}"
+            continue
+        try:
+            if "start" in rec:
+                yield rid, _key(*rec["start"])
+            else:
+                yield rid, _key(rec["m_left"], rec["c_left"], rec["boat"])
+        except (KeyError, TypeError, ValueError) as e:
+            yield rid, f"bad record: {e}"
+
+def _read_csv(lines: Iterable[str]) -> Iterator[Tuple[str, object]]:
+    cols = None
+    n = 0
+    for row in csv.reader(lines):
+        if not row or not "".join(row).strip():
+            continue
+        row = [f.strip() for f in row]
+        if cols is None and "m_left" in row:
+            cols = {name: i for i, name in enumerate(row)}
+            continue
+        n += 1
+        # the id first, so a row that fails to parse is still reported under it
+        if cols is not None:
+            rid = row[cols["id"]] if "id" in cols and cols["id"] < len(row) else str(n)
+        else:
+            rid = row[3] if len(row) > 3 else str(n)
+        try:
+            if cols is not None:
+                key = _key(row[cols["m_left"]], row[cols["c_left"]], row[cols["boat"]])
+            else:
+                key = _key(row[0], row[1], row[2])
+        except (IndexError, KeyError, ValueError) as e:
+            yield rid, f"bad record: {e}"
+            continue
+        yield rid, key
+
+# -------- Solving --------
+def solve_one(solver_fn, start: StateKey, *, spec: ProblemSpec, memory: bool = False, cache=None, seed=None) -> Tuple[dict, List[StateKey]]:
+    """run_single without printing: (result dict, path keys). tracemalloc is
+    only switched on with memory=True, since it slows every solver down.
+    Memory runs bypass the cache: a cached result carries no peak_kb."""
+    key = cache.key(solver_fn, start, spec, seed) if cache is not None and not memory else None
+    hit = cache.get(key) if key is not None else None
+    if hit is not None:
+        res, path = hit
+        return dict(res, cached=True), path
+    if seed is not None:
+        random.seed(seed)
+    metr = Metrics()
+    if memory:
+        tracemalloc.start()
+    try:
+        t0 = time.perf_counter()
+        goal = _call_solver(solver_fn, start, metr, spec)
+        t1 = time.perf_counter()
+        if memory:
+            metr.track_memory()
+    finally:
+        # a solver that raises must not leave tracing on for everything after it
+        if memory:
+            tracemalloc.stop()
+    path = reconstruct_path(goal)
+    res = {"success": goal is not None, "path_len": len(path) - 1 if goal is not None else None, "time": t1 - t0, "expanded": metr.expanded, "frontier": metr.max_frontier, "peak_kb": metr.peak_mem_kb, "parts": {part: {"expanded": pm.expanded, "frontier": pm.max_frontier} for part, pm in metr.parts.items()}}
+    if key is not None:
+        cache.put(key, res, path)
+    return res, path
+
+def solve_stream(starts: Iterable[Tuple[str, object]], algos: List[str], *, spec: ProblemSpec = DEFAULT_SPEC, with_path: bool = True, gap: bool = False, memory: bool = False, cache=None, seed: Optional[int] = None) -> Iterator[dict]:
+    """One output record per (start, algorithm), produced lazily so memory
+    doesn't grow with the number of starts."""
+    table = get_distance_table(spec) if gap else None
+    for rid, start in starts:
+        if isinstance(start, str):
+            yield {"id": rid, "error": start}
+            continue
+        opt = table.distance(start) if table is not None else None
+        for name in algos:
+            rec = {"id": rid, "start": [start.m_left, start.c_left, start.boat], "algo": name}
+            try:
+                res, path = solve_one(SOLVERS[name], start, spec=spec, memory=memory, cache=cache, seed=None if seed is None else f"{seed}/{rid}/{name}")
+            except Exception as e:  # one bad start must not end the stream
+                rec["error"] = f"{type(e).__name__}: {e}"
+                yield rec
+                continue
+            rec.update(res)
+            if not rec["parts"]:
+                del rec["parts"]
+            if not memory:
+                del rec["peak_kb"]
+            if gap:
+                rec["optimal"] = opt
+                rec["gap"] = res["path_len"] - opt if res["path_len"] is not None and opt is not None else None
+            if with_path:
+                rec["path"] = [[k.m_left, k.c_left, k.boat] for k in path]
+            yield rec
+
+def write_jsonl(records: Iterable[dict], out: TextIO, *, flush: bool = False) -> int:
+    n = 0
+    for rec in records:
+        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        if flush:
+            out.flush()
+        n += 1
+    return n
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Solve start states from a CSV/JSONL file (or stdin) and write one JSONL record per result.")
+    ap.add_argument("input", nargs="?", default="-", help="input file, '-' for stdin (default)")
+    ap.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    ap.add_argument("-f", "--format", choices=("auto", "csv", "jsonl"), default="auto")
+    ap.add_argument("-a", "--algo", default="bfs", help=f"comma-separated solver names: {', '.join(SOLVERS)}")
+    ap.add_argument("--m", type=int, default=DEFAULT_SPEC.total_m, help="total missionaries")
+    ap.add_argument("--c", type=int, default=DEFAULT_SPEC.total_c, help="total cannibals")
+    ap.add_argument("--capacity", type=int, default=DEFAULT_SPEC.capacity, help="boat capacity")
+    ap.add_argument("--seed", type=int, default=None, help="base seed; makes randomized solvers reproducible")
+    ap.add_argument("--no-path", action="store_true", help="omit the path from each record")
+    ap.add_argument("--gap", action="store_true", help="add the optimal length and the gap to it")
+    ap.add_argument("--memory", action="store_true", help="trace peak memory (slower)")
+    ap.add_argument("--cache", default=None, help="sqlite solve-cache file to read and fill")
+    ap.add_argument("--flush", action="store_true", help="flush after every record (for pipes)")
+    args = ap.parse_args(argv)
+    algos = [a.strip() for a in args.algo.split(",") if a.strip()]
+    unknown = [a for a in algos if a not in SOLVERS]
+    if unknown:
+        ap.error(f"unknown solver(s): {', '.join(unknown)}")
+    spec = ProblemSpec(args.m, args.c, args.capacity)
+    cache = open_cache(args.cache) if args.cache else None
+    fin = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        records = solve_stream(read_starts(fin, args.format), algos, spec=spec, with_path=not args.no_path, gap=args.gap, memory=args.memory, cache=cache, seed=args.seed)
+        write_jsonl(records, fout, flush=args.flush)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
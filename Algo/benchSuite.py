@@ -0,0 +1,339 @@
+# Regression benchmark suite: every solver over a grid of problem sizes,
+# saved as versioned JSON and compared against a stored baseline
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, measure_single, is_goal_key
+from retrograde import get_distance_table
+from solveCache import RANDOMIZED, solver_id
+from batchSolve import SOLVERS
+from data import TEST_CASES
+
+# Bump when the record layout changes; compare() refuses other versions.
+SCHEMA_VERSION = 1
+
+# (M, C, capacity): the first three are the --quick grid
+GRID = [
+    ProblemSpec(3, 3, 2),
+    ProblemSpec(3, 3, 3),
+    ProblemSpec(5, 5, 3),
+    ProblemSpec(10, 10, 4),
+    ProblemSpec(30, 30, 4),
+    ProblemSpec(100, 100, 6),
+]
+QUICK = 3
+
+# largest total_m a solver is run at; beyond it one solve takes seconds
+MAX_M = {"ida": 5}
+# fewest timed runs per record: below 8 vs 8 the two-sided Mann-Whitney p
+# can't get under 0.01 once Benjamini-Hochberg has lowered the threshold
+# (5 vs 5 bottoms out at 0.012), so a slowdown could never be flagged
+MIN_ITERATIONS = 8
+# fewer timed runs for slow solvers, but never below MIN_ITERATIONS
+MAX_ITERATIONS = {"sa-batch": MIN_ITERATIONS}
+
+# -------- Cases --------
+def bench_cases(spec: ProblemSpec, generated: int, seed: int) -> List[Tuple[str, StateKey]]:
+    """The full-bank start, `generated` random solvable states of spec
+    (same ones for the same seed), plus data.TEST_CASES for DEFAULT_SPEC."""
+    cases = [("start", StateKey(spec.total_m, spec.total_c, 'L'))]
+    if spec == DEFAULT_SPEC:
+        cases += [(name, k) for name, k in TEST_CASES if k != cases[0][1]]
+    table = get_distance_table(spec)
+    g = table.graph
+    pool = [g.keys[u] for u in range(g.n_valid) if table.dist[u] > 0 and not is_goal_key(g.keys[u]) and g.keys[u] != cases[0][1]]
+    rng = random.Random(f"{seed}/{spec.total_m}/{spec.total_c}/{spec.capacity}")
+    for i, k in enumerate(rng.sample(pool, min(generated, len(pool)))):
+        cases.append((f"gen{i + 1}", k))
+    return cases
+
+def _spec_list(spec: ProblemSpec) -> List[int]:
+    return [spec.total_m, spec.total_c, spec.capacity]
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+# -------- Running --------
+def calibrate(reps: int = 5) -> float:
+    """Best-of-reps seconds of a fixed dict/sort loop that shares no code
+    with the solvers. Timed next to each measurement, it tracks
+    the machine's current speed (frequency scaling, noisy neighbours), so
+    compare() can divide that drift out."""
+    best = None
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        d: Dict[int, int] = {}
+        for i in range(20000):
+            d[i & 1023] = d.get(i & 1023, 0) + i
+        sorted(d.values())
+        dt = time.perf_counter() - t0
+        if best is None or dt < best:
+            best = dt
+    return best
+
+def run_suite(*, solvers: Optional[List[str]] = None, grid: Optional[List[ProblemSpec]] = None, iterations: int = 15, warmup: int = 2, generated: int = 4, seed: int = 0, log=sys.stderr) -> dict:
+    """Benchmark each solver on each case of each spec with measure_single.
+
+    Randomized solvers are reseeded per (solver, spec, case), so expanded /
+    frontier / gap are reproducible run to run and only timings are noisy;
+    each record also carries a calibrate() taken just before it as "calib".
+    Graphs and tables are cached per process, so the warmup runs absorb
+    their build and the timings are steady-state solves."""
+    if iterations < MIN_ITERATIONS:
+        raise ValueError(f"iterations must be at least {MIN_ITERATIONS} for the timing test to have any power")
+    names = solvers or list(SOLVERS)
+    grid = grid or GRID
+    results = []
+    for spec in grid:
+        cases = bench_cases(spec, generated, seed)
+        table = get_distance_table(spec)
+        for name in names:
+            if spec.total_m > MAX_M.get(name, spec.total_m):
+                continue
+            fn = SOLVERS[name]
+            for case, start in cases:
+                rec = {"solver": name, "spec": _spec_list(spec), "case": case, "start": [start.m_left, start.c_left, start.boat], "calib": calibrate()}
+                opt = table.distance(start)
+                random.seed(f"{seed}/{name}/{spec.total_m}/{spec.total_c}/{spec.capacity}/{case}")
+                try:
+                    res = measure_single(fn, start, iterations=min(iterations, MAX_ITERATIONS.get(name, iterations)), warmup=warmup, spec=spec, keep_times=True)
+                except Exception as e:  # record it; one broken solver must not end the run
+                    rec["error"] = f"{type(e).__name__}: {e}"
+                    results.append(rec)
+                    continue
+                rec.update(res)
+                rec["optimal"] = opt
+                rec["gap"] = res["path_len"] - opt if res["success"] and opt is not None else None
+                results.append(rec)
+            if log:
+                print(f"  {spec.total_m}/{spec.total_c}/{spec.capacity} {name}: {len(cases)} cases", file=log, flush=True)
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_rev(),
+        "env": environment(),
+        "settings": {"iterations": iterations, "warmup": warmup, "generated": generated, "seed": seed, "grid": [_spec_list(s) for s in grid], "solvers": names},
+        "results": results,
+    }
+
+def save(doc: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=1)
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    if doc.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path}: schema {doc.get('schema')!r}, expected {SCHEMA_VERSION}; re-record the baseline")
+    return doc
+
+# -------- Statistics --------
+def mann_whitney_greater(a: List[float], b: List[float]) -> float:
+    """One-sided p-value that samples `a` tend to be larger than `b`
+    (Mann-Whitney U, normal approximation with tie and continuity
+    correction). Rank-based, so a few outlier runs don't decide it."""
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    pooled = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    n = n1 + n2
+    rank_a = 0.0
+    ties = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        avg = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        rank_a += avg * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        i = j + 1
+    u = rank_a - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    var = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(var)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def min_two_sided_p(n1: int, n2: int) -> float:
+    # p of two fully separated samples: nothing smaller is reachable
+    return min(1.0, 2 * mann_whitney_greater(list(range(n2, n2 + n1)), list(range(n2))))
+
+# -------- Comparison --------
+def _key(rec: dict) -> Tuple[str, Tuple[int, ...], str]:
+    return rec["solver"], tuple(rec["spec"]), rec["case"]
+
+def compare(base: dict, cur: dict, *, alpha: float = 0.01, min_slowdown: float = 0.25, min_delta: float = 20e-6, mem_tolerance: float = 0.10, mem_min_kb: int = 16, normalize: bool = True) -> dict:
+    """Findings of cur against base, matched by (solver, spec, case).
+
+    - slower / faster: per (solver, spec), over its cases. Each case gets a
+      two-sided Mann-Whitney p on its time samples, corrected across all
+      records with Benjamini-Hochberg at false discovery rate alpha. A
+      group is flagged when its median time ratio is past min_slowdown and
+      more than half of its cases are significant that way: samples taken
+      back to back share the machine's state, so single-case hits are
+      mostly noise, while real regressions move the whole group. Cases whose
+      medians differ by less than min_delta seconds don't count. With
+      normalize, current times are first scaled by the ratio of the two
+      runs' calib, so a machine running slower overall isn't flagged
+    - memory: peak KB up by more than mem_tolerance and mem_min_kb
+    - expanded / frontier: any increase for deterministic solvers, more
+      than mem_tolerance for randomized ones
+    - gap / success / error: a worse path, a lost solution, a new exception
+    Everything but "faster" counts as a regression."""
+    base_by = {_key(r): r for r in base["results"]}
+    findings = []
+    timing = []   # (p, group, ratio, median delta) per matched record
+    ratios = []
+    matched = 0
+    weak = 0      # records too small for their p to ever reach alpha
+    for r in cur["results"]:
+        b = base_by.get(_key(r))
+        if b is None:
+            continue
+        matched += 1
+        where = {"solver": r["solver"], "spec": r["spec"], "case": r["case"]}
+        if "error" in r:
+            if "error" not in b:
+                findings.append(dict(where, kind="error", detail=r["error"]))
+            continue
+        if "error" in b:
+            continue
+        randomized = solver_id(SOLVERS[r["solver"]]) in RANDOMIZED if r["solver"] in SOLVERS else False
+        if b["success"] and not r["success"]:
+            findings.append(dict(where, kind="success", detail="no longer solved"))
+        if b["gap"] is not None and r["gap"] is not None and r["gap"] > b["gap"]:
+            findings.append(dict(where, kind="gap", base=b["gap"], cur=r["gap"]))
+        scale = b["calib"] / r["calib"] if normalize and b.get("calib") and r.get("calib") else 1.0
+        times = [t * scale for t in r["times"]]
+        median = r["time_median"] * scale
+        ratio = median / b["time_median"] if b["time_median"] > 0 else 1.0
+        ratios.append(ratio)
+        # two-sided p: the direction comes from the data, not beforehand
+        p = min(1.0, 2 * (mann_whitney_greater(times, b["times"]) if ratio >= 1 else mann_whitney_greater(b["times"], times)))
+        timing.append((p, (r["solver"], tuple(r["spec"])), ratio, abs(median - b["time_median"])))
+        if min_two_sided_p(len(times), len(b["times"])) > alpha:
+            weak += 1
+        if r["peak_kb"] > b["peak_kb"] * (1 + mem_tolerance) and r["peak_kb"] - b["peak_kb"] >= mem_min_kb:
+            findings.append(dict(where, kind="memory", base=b["peak_kb"], cur=r["peak_kb"], ratio=r["peak_kb"] / b["peak_kb"] if b["peak_kb"] else None))
+        for metric in ("expanded", "frontier"):
+            limit = b[metric] * (1 + mem_tolerance) if randomized else b[metric]
+            if r[metric] > limit:
+                findings.append(dict(where, kind=metric, base=b[metric], cur=r[metric]))
+    timing.sort(key=lambda t: t[0])
+    cut = 0
+    for i, t in enumerate(timing, 1):
+        if t[0] <= alpha * i / len(timing):
+            cut = i
+    groups: Dict[Tuple[str, Tuple[int, ...]], List[Tuple[float, float, bool]]] = {}
+    for i, (p, group, ratio, delta) in enumerate(timing):
+        groups.setdefault(group, []).append((ratio, p, i < cut and delta >= min_delta))
+    for (solver, spec), rows in groups.items():
+        mid = statistics.median(ratio for ratio, _, _ in rows)
+        for kind, past, sig in (("slower", mid >= 1 + min_slowdown, lambda x: x > 1), ("faster", mid <= 1 / (1 + min_slowdown), lambda x: x < 1)):
+            hits = [p for ratio, p, ok in rows if ok and sig(ratio)]
+            if past and len(hits) * 2 > len(rows):
+                findings.append({"solver": solver, "spec": list(spec), "case": f"{len(hits)}/{len(rows)} cases", "kind": kind, "ratio": mid, "p": max(hits)})
+    geo = math.exp(sum(math.log(x) for x in ratios if x > 0) / len(ratios)) if ratios else None
+    return {
+        "matched": matched,
+        "missing": len(base_by) - matched,
+        "time_ratio_geomean": geo,
+        "env_changed": base.get("env") != cur.get("env"),
+        "normalized": normalize,
+        "untestable": weak,
+        "findings": findings,
+        "regressions": sum(1 for f in findings if f["kind"] != "faster"),
+    }
+
+def print_report(report: dict, base: dict, cur: dict):
+    print(f"baseline {base.get('git')} ({base.get('created')})  vs  current {cur.get('git')} ({cur.get('created')})")
+    if report["env_changed"]:
+        print("warning: different Python / machine than the baseline; timings are not comparable")
+    geo = report["time_ratio_geomean"]
+    if report["normalized"]:
+        print("current times scaled by the calibration ratio (--raw to disable)")
+    if report["untestable"]:
+        print(f"warning: {report['untestable']} record(s) have too few time samples for a timing test at this alpha (re-record with --iterations {MIN_ITERATIONS} or more)")
+    print(f"matched {report['matched']} records, {report['missing']} baseline records not run; median time ratio (geomean) {geo:.3f}" if geo else f"matched {report['matched']} records")
+    if report["findings"]:
+        # slower / faster rows are per (solver, spec): Ratio is the median over its cases
+        print("\nKind\tSolver\tSpec\tCase\tBase\tCurrent\tRatio\tp")
+    for f in report["findings"]:
+        spec = "/".join(map(str, f["spec"]))
+        base_v, cur_v = f.get("base", ""), f.get("cur", f.get("detail", ""))
+        ratio = f"{f['ratio']:.2f}" if f.get("ratio") is not None else ""
+        p = f"{f['p']:.1e}" if "p" in f else ""
+        print(f"{f['kind']}\t{f['solver']}\t{spec}\t{f['case']}\t{base_v}\t{cur_v}\t{ratio}\t{p}")
+    print(f"\n{report['regressions']} regression(s)")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark every solver over a grid of problem sizes and check for regressions against a baseline.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="run the suite, write results, optionally compare")
+    r.add_argument("-o", "--output", default=None, help="results file (default: bench_<git rev>.json)")
+    r.add_argument("--baseline", default=None, help="compare against this results file; exit 1 on regressions")
+    r.add_argument("--quick", action="store_true", help=f"only the first {QUICK} specs of the grid")
+    r.add_argument("--solvers", default=None, help=f"comma-separated subset of: {', '.join(SOLVERS)}")
+    r.add_argument("--iterations", type=int, default=15, help=f"timed runs per record (at least {MIN_ITERATIONS})")
+    r.add_argument("--warmup", type=int, default=2)
+    r.add_argument("--generated", type=int, default=4, help="random start states per spec")
+    r.add_argument("--seed", type=int, default=0)
+    c = sub.add_parser("compare", help="compare two results files")
+    c.add_argument("baseline")
+    c.add_argument("current")
+    for p in (r, c):
+        p.add_argument("--alpha", type=float, default=0.01, help="false discovery rate of the timing tests")
+        p.add_argument("--min-slowdown", type=float, default=0.25, help="smallest median slowdown worth flagging (lower it on a quiet machine)")
+        p.add_argument("--min-delta", type=float, default=20e-6, help="smallest median change in seconds worth flagging")
+        p.add_argument("--raw", action="store_true", help="compare raw times, without the calibration scaling")
+        p.add_argument("--mem-tolerance", type=float, default=0.10, help="allowed relative growth of peak KB / expanded / frontier")
+    args = ap.parse_args(argv)
+    thresholds = {"alpha": args.alpha, "min_slowdown": args.min_slowdown, "min_delta": args.min_delta, "mem_tolerance": args.mem_tolerance, "normalize": not args.raw}
+    if args.cmd == "compare":
+        base, cur = load(args.baseline), load(args.current)
+    else:
+        solvers = [s.strip() for s in args.solvers.split(",") if s.strip()] if args.solvers else None
+        unknown = [s for s in solvers or [] if s not in SOLVERS]
+        if unknown:
+            ap.error(f"unknown solver(s): {', '.join(unknown)}")
+        if args.iterations < MIN_ITERATIONS:
+            ap.error(f"--iterations must be at least {MIN_ITERATIONS}: fewer samples can never show a significant slowdown")
+        base = load(args.baseline) if args.baseline else None
+        cur = run_suite(solvers=solvers, grid=GRID[:QUICK] if args.quick else GRID, iterations=args.iterations, warmup=args.warmup, generated=args.generated, seed=args.seed)
+        out = args.output or f"bench_{cur['git'] or 'local'}.json"
+        save(cur, out)
+        print(f"Wrote {out} ({len(cur['results'])} records)")
+        if base is None:
+            return 0
+    report = compare(base, cur, **thresholds)
+    print_report(report, base, cur)
+    return 1 if report["regressions"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
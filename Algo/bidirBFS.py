@@ -0,0 +1,92 @@
+#Bidirectional Breadth-First Search
+
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, Metrics, run_single, run_all_extended
+from stateGraph import StateGraph, GraphTree, GraphTrace, start_graph
+from retrograde import optimal_lengths
+from data import TEST_CASES
+
+ALGO_NAME = "Bidirectional BFS"
+
+def _expand_layer(graph: StateGraph, layer, mine: GraphTree, other: GraphTree, part: Metrics, metr: Metrics):
+    # expand one whole BFS layer; return the next layer and the cheapest meeting state
+    offsets, targets, labels = graph.offsets, graph.targets, graph.labels
+    depth, other_depth = mine.g, other.g
+    nxt = []
+    meet, meet_cost = None, None
+    for u in layer:
+        part.bump()
+        metr.bump()
+        gv = depth[u] + 1
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if depth[v] < 0:
+                mine.add(v, u, labels[e], gv)
+                nxt.append(v)
+                if other_depth[v] >= 0 and (meet is None or gv + other_depth[v] < meet_cost):
+                    meet, meet_cost = v, gv + other_depth[v]
+    return nxt, meet
+
+def _join(graph: StateGraph, fwd: GraphTree, bwd: GraphTree, meet: int):
+    # forward path start -> meet, then follow backward parents meet -> goal
+    ids = fwd.path_ids(meet)
+    trace = GraphTrace(graph, ids[0])
+    pos = 0
+    for i in ids[1:]:
+        pos = trace.step(i, fwd.move[i])
+    v = meet
+    while bwd.parent[v] >= 0:
+        # moves are reversible: v -> parent uses the same load as parent -> v
+        pos = trace.step(bwd.parent[v], bwd.move[v])
+        v = bwd.parent[v]
+    return trace.node(pos)
+
+def bidir_bfs_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC):
+    graph, s0 = start_graph(start, spec)
+    if s0 is None or graph.goal_id is None:
+        return None
+    fwd, bwd = GraphTree(graph), GraphTree(graph)
+    fwd.add(s0, -1, -1, 0)
+    bwd.add(graph.goal_id, -1, -1, 0)
+    mf, mb = Metrics(), Metrics()
+    metr.parts = {"forward": mf, "backward": mb}
+    if graph.goal[s0]:
+        mf.bump()
+        metr.bump()
+        return fwd.node(s0)
+    ff, fb = [s0], [graph.goal_id]
+    while ff and fb:
+        metr.track_frontier(len(ff) + len(fb))
+        mf.track_frontier(len(ff))
+        mb.track_frontier(len(fb))
+        # grow the smaller side; a full layer is expanded so the meeting is optimal
+        if len(ff) <= len(fb):
+            ff, meet = _expand_layer(graph, ff, fwd, bwd, mf, metr)
+        else:
+            fb, meet = _expand_layer(graph, fb, bwd, fwd, mb, metr)
+        if meet is not None:
+            return _join(graph, fwd, bwd, meet)
+    return None
+
+def main():
+    optimal = optimal_lengths(TEST_CASES)
+    while True:
+        print(f"\n=== {ALGO_NAME} Menu ===")
+        print("1) Choose ONE test case → animate + show metrics")
+        print("2) Run ALL test cases (no animation) → summary table")
+        print("0) Exit")
+        sel = input("Select: ").strip()
+        if sel == "1":
+            for i,(name, s) in enumerate(TEST_CASES,1):
+                print(f"{i}) {name}: start={s}")
+            idx = int(input("Pick one: ").strip()) - 1
+            name, start = TEST_CASES[idx]
+            run_single(bidir_bfs_solver, start, ALGO_NAME, animate=True, anim_speed=0.6)
+        elif sel == "2":
+            run_all_extended(bidir_bfs_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1)
+        elif sel == "0":
+            break
+        else:
+            print("Invalid selection.")
+
+if __name__ == "__main__":
+    main()
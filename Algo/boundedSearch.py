@@ -0,0 +1,140 @@
+#Memory-Bounded Search (IDA*, Breadth-First Frontier Search)
+
+from typing import Dict, List, Optional, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, Metrics, heuristic_trips_remaining, run_single, run_all_extended
+from nodePool import KeyPath, pack_key, unpack_id, expand_id
+from heuristics import resolve_heuristic
+from retrograde import optimal_lengths
+from data import TEST_CASES
+
+ALGO_NAME = "Memory-Bounded"
+
+# -------- IDA* --------
+def ida_star_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, heuristic=heuristic_trips_remaining):
+    """Iterative-deepening A*: depth-first passes bounded by f = g + h, each
+    pass raising the bound to the smallest f that exceeded it. Only the
+    current path (and one child iterator per level) is kept, so memory is
+    O(depth); cycles are cut by refusing states already on the path."""
+    heuristic = resolve_heuristic(heuristic, spec)
+    goal = pack_key(StateKey(0, 0, 'R'), spec)
+    s0 = pack_key(start, spec)
+    def h(sid: int) -> int:
+        return heuristic(unpack_id(sid, spec), spec)
+    metr.bump()
+    if s0 == goal:
+        return KeyPath([start]).node(0)
+    bound = h(s0)
+    while True:
+        next_bound = None
+        path = [s0]
+        on_path = {s0}
+        stack = [iter(expand_id(s0, spec))]
+        while stack:
+            metr.track_frontier(len(path))
+            for v, _ in stack[-1]:
+                if v in on_path:
+                    continue
+                f = len(path) + h(v)  # g(v) = len(path)
+                if f > bound:
+                    if next_bound is None or f < next_bound:
+                        next_bound = f
+                    continue
+                path.append(v)
+                if v == goal:
+                    keys = KeyPath([unpack_id(i, spec) for i in path])
+                    return keys.node(len(keys) - 1)
+                on_path.add(v)
+                metr.bump()
+                stack.append(iter(expand_id(v, spec)))
+                break
+            else:
+                # children exhausted: backtrack
+                stack.pop()
+                on_path.discard(path.pop())
+        if next_bound is None:
+            return None
+        bound = next_bound
+
+# -------- Breadth-First Frontier Search --------
+def _frontier_layers(src: int, dst: int, spec: ProblemSpec, metr: Metrics, mid_depth: int = -1) -> Tuple[Optional[int], Optional[int]]:
+    """Layered BFS from src keeping only the previous, current and next
+    layers (moves are reversible, so the previous layer is all that is
+    needed to stop walking backwards). Returns (depth of dst, ancestor of
+    dst at mid_depth) or (None, None) if dst is unreachable."""
+    # each layer maps state -> its ancestor at mid_depth (-1 until known)
+    prev: Dict[int, int] = {}
+    cur: Dict[int, int] = {src: src if mid_depth == 0 else -1}
+    depth = 0
+    while cur:
+        metr.track_frontier(len(prev) + len(cur))
+        if dst in cur:
+            return depth, cur[dst]
+        nxt: Dict[int, int] = {}
+        for u, mid in cur.items():
+            metr.bump()
+            for v, _ in expand_id(u, spec):
+                if v in cur or v in prev or v in nxt:
+                    continue
+                nxt[v] = v if depth + 1 == mid_depth else mid
+        prev, cur = cur, nxt
+        depth += 1
+    return None, None
+
+def _frontier_path(src: int, dst: int, d: int, spec: ProblemSpec, metr: Metrics, out: List[int]):
+    # divide and conquer: find the state halfway along an optimal src->dst
+    # path, then solve both halves; appends the path after src to out
+    if d == 0:
+        return
+    if d == 1:
+        out.append(dst)
+        return
+    half = d // 2
+    _, mid = _frontier_layers(src, dst, spec, metr, half)
+    _frontier_path(src, mid, half, spec, metr, out)
+    _frontier_path(mid, dst, d - half, spec, metr, out)
+
+def frontier_bfs_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC):
+    """BFS without a closed set or parent pointers: one pass finds the optimal
+    depth, then the path is rebuilt by recursive halving. Memory is O(frontier)
+    plus the O(log depth) recursion; time is O(states * log depth)."""
+    s0 = pack_key(start, spec)
+    goal = pack_key(StateKey(0, 0, 'R'), spec)
+    d, _ = _frontier_layers(s0, goal, spec, metr)
+    if d is None:
+        return None
+    ids = [s0]
+    _frontier_path(s0, goal, d, spec, metr, ids)
+    keys = KeyPath([unpack_id(i, spec) for i in ids])
+    return keys.node(len(keys) - 1)
+
+SOLVERS = [("IDA*", ida_star_solver), ("Frontier BFS", frontier_bfs_solver)]
+
+def main():
+    optimal = optimal_lengths(TEST_CASES)
+    algo_name, solver = SOLVERS[0]
+    while True:
+        print(f"\n=== {ALGO_NAME} Menu ({algo_name}) ===")
+        print("1) Choose ONE test case → animate + show metrics")
+        print("2) Run ALL test cases (no animation) → summary table")
+        print("3) Switch algorithm")
+        print("0) Exit")
+        sel = input("Select: ").strip()
+        if sel == "1":
+            for i,(name, s) in enumerate(TEST_CASES,1):
+                print(f"{i}) {name}: start={s}")
+            idx = int(input("Pick one: ").strip()) - 1
+            name, start = TEST_CASES[idx]
+            run_single(solver, start, algo_name, animate=True, anim_speed=0.6)
+        elif sel == "2":
+            run_all_extended(solver, TEST_CASES, algo_name=algo_name, optimal_by_case=optimal, repeats=1)
+        elif sel == "3":
+            for i,(name, _) in enumerate(SOLVERS,1):
+                print(f"{i}) {name}")
+            algo_name, solver = SOLVERS[int(input("Pick one: ").strip()) - 1]
+        elif sel == "0":
+            break
+        else:
+            print("Invalid selection.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#Closed-form schedules for the M = C family (falls back to A*)
+
+from typing import Dict, List, Optional, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, State, Metrics, reconstruct_path, run_single, run_all_extended
+from retrograde import get_distance_table, optimal_lengths
+from YeapYongJin import astar_solver
+from data import TEST_CASES
+
+ALGO_NAME = "Closed-Form"
+
+# -------- Constructive schedule --------
+# With N missionaries, N cannibals and capacity b, a round trip that takes
+# (x, x) over with x = b // 2 and brings (1, 1) back keeps both banks
+# balanced and moves p = x - 1 pairs. Past a small size every optimal
+# schedule is such a round trip plus an optimal schedule for N - p, i.e.
+#     trips(N) = trips(N0) + 2 * (N - N0) / p   for N0 = N (mod p), N0 >= 2b
+# (checked against the retrograde table for b = 4..12, N <= 120). With
+# b = 2 or 3 nothing from N = 2b on is solvable.
+
+def _pairs_per_round_trip(capacity: int) -> int:
+    return capacity // 2 - 1
+
+def _base_size(n: int, capacity: int) -> int:
+    # smallest N0 >= 2b with N0 = n (mod p); n itself when n is small
+    p = _pairs_per_round_trip(capacity)
+    lo = 2 * capacity
+    if n < lo + p:
+        return n
+    return lo + (n - lo) % p
+
+_BASES: Dict[ProblemSpec, Tuple[List[StateKey], int]] = {}
+
+def _base_schedule(spec: ProblemSpec) -> Tuple[List[StateKey], int]:
+    """Optimal schedule for a constant-size instance plus the position where
+    the extra round trips are spliced in: a balanced state with the boat on
+    the left, before which the left bank never has cannibals alone and after
+    which the right bank never does (the spliced pairs would be outnumbered
+    there). -1 if the schedule has no such state."""
+    base = _BASES.get(spec)
+    if base is None:
+        N = spec.total_m
+        keys = reconstruct_path(get_distance_table(spec).optimal_path(StateKey(N, N, 'L')))
+        at = -1
+        for i, k in enumerate(keys):
+            if k.boat != 'L' or k.m_left != k.c_left or k.m_left < 1:
+                continue
+            if any(j.m_left == 0 and j.c_left > 0 for j in keys[:i]):
+                break  # only gets worse further along
+            if not any(j.m_left == N and j.c_left < N for j in keys[i:]):
+                at = i
+                break
+        base = _BASES[spec] = (keys, at)
+    return base
+
+def _chain(keys: List[StateKey]) -> State:
+    # State chain with last_move read off consecutive keys
+    s = State(keys[0], 0, None, None)
+    for k in keys[1:]:
+        prev = s.key
+        mv = (abs(prev.m_left - k.m_left), abs(prev.c_left - k.c_left), "L→R" if prev.boat == 'L' else "R→L")
+        s = State(k, s.g + 1, s, mv)
+    return s
+
+def closed_form_keys(spec: ProblemSpec) -> Optional[List[StateKey]]:
+    """Optimal (N, N, 'L') -> goal schedule for an M = C spec without searching
+    the instance. Returns None if it is unsolvable; raises ValueError for
+    specs outside the family."""
+    N, b = spec.total_m, spec.capacity
+    if spec.total_c != N or b < 2:
+        raise ValueError(f"no closed form for {spec}")
+    if b < 4 and N >= 2 * b:
+        return None
+    N0 = _base_size(N, b)
+    keys, at = _base_schedule(ProblemSpec(N0, N0, b))
+    if not keys:
+        return None
+    if N0 == N:
+        return keys
+    if at < 0:
+        raise ValueError(f"no splice point in the base schedule for {spec}")
+    x, p = b // 2, _pairs_per_round_trip(b)
+    extra = N - N0
+    out = [StateKey(k.m_left + extra, k.c_left + extra, k.boat) for k in keys[:at]]
+    left = keys[at].m_left + extra
+    while left > keys[at].m_left:
+        out.append(StateKey(left, left, 'L'))
+        out.append(StateKey(left - x, left - x, 'R'))
+        left -= p
+    out.extend(keys[at:])
+    return out
+
+def closed_form_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, fallback=astar_solver):
+    """Analytic schedule for M = C specs started from (N, N, 'L'); other
+    specs and starts go to `fallback`. Nothing is expanded on the fast path:
+    the only work is a cached base schedule of size <= 2b + p and one State
+    per trip."""
+    N = spec.total_m
+    if spec.total_c == N and spec.capacity >= 2 and start == StateKey(N, N, 'L'):
+        try:
+            keys = closed_form_keys(spec)
+        except ValueError:
+            pass
+        else:
+            return _chain(keys) if keys else None
+    return fallback(start, metr, spec=spec)
+
+def main():
+    optimal = optimal_lengths(TEST_CASES)
+    while True:
+        print(f"\n=== {ALGO_NAME} Menu ===")
+        print("1) Choose ONE test case → animate + show metrics")
+        print("2) Run ALL test cases (no animation) → summary table")
+        print("3) Solve a large N = M = C instance → trip count")
+        print("0) Exit")
+        sel = input("Select: ").strip()
+        if sel == "1":
+            for i,(name, s) in enumerate(TEST_CASES,1):
+                print(f"{i}) {name}: start={s}")
+            idx = int(input("Pick one: ").strip()) - 1
+            name, start = TEST_CASES[idx]
+            run_single(closed_form_solver, start, ALGO_NAME, animate=True, anim_speed=0.6)
+        elif sel == "2":
+            run_all_extended(closed_form_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1)
+        elif sel == "3":
+            n = int(input("N: ").strip())
+            b = int(input("Boat capacity: ").strip())
+            spec = ProblemSpec(n, n, b)
+            run_single(closed_form_solver, StateKey(n, n, 'L'), ALGO_NAME, animate=False, spec=spec)
+        elif sel == "0":
+            break
+        else:
+            print("Invalid selection.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Solver instrumentation: opt-in event stream + per-phase timers
+
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, State, successors, is_valid_key
+
+# event kinds, delivered to subscribers as fn(kind, state)
+EXPAND = "expand"      # a state is taken off the frontier and expanded
+GENERATE = "generate"  # a valid successor was produced
+PRUNE = "prune"        # a successor was dropped (already visited / no better g / rejected)
+GOAL = "goal"          # the goal was reached; the solver returns right after
+EVENTS = (EXPAND, GENERATE, PRUNE, GOAL)
+
+class EventBus:
+    """Pass as `events=` to a solver to observe it.
+
+    Solvers decide once, before their loop, whether a bus is attached: with
+    events=None they bind the plain successors()/queue methods and only test
+    a local `if events:` at each hook, so an uninstrumented run makes no
+    extra calls. With a bus they bind timed wrappers instead.
+
+    phase_times accumulates seconds per phase: "successors" (successor
+    generation, inclusive of "validity"), "validity" (is_valid_key calls)
+    and "queue" (frontier push/pop)."""
+
+    def __init__(self):
+        self._subs: Dict[str, List[Callable]] = {k: [] for k in EVENTS}
+        self.counts: Dict[str, int] = {k: 0 for k in EVENTS}
+        self.phase_times: Dict[str, float] = {"successors": 0.0, "validity": 0.0, "queue": 0.0}
+
+    def subscribe(self, fn: Callable, kinds: Tuple[str, ...] = EVENTS) -> Callable:
+        for k in kinds:
+            self._subs[k].append(fn)
+        return fn
+
+    def emit(self, kind: str, s: State):
+        self.counts[kind] += 1
+        for fn in self._subs[kind]:
+            fn(kind, s)
+
+    def expand(self, s: State):
+        self.emit(EXPAND, s)
+
+    def prune(self, s: State):
+        self.emit(PRUNE, s)
+
+    def goal(self, s: State):
+        self.emit(GOAL, s)
+
+    def timed(self, phase: str, fn: Callable) -> Callable:
+        """Wrap fn so its wall time is added to phase_times[phase]."""
+        times = self.phase_times
+        clock = time.perf_counter
+        def wrapper(*args, **kwargs):
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                times[phase] += clock() - t0
+        return wrapper
+
+    def successors(self, s: State, *, order: str = "deterministic", spec: ProblemSpec = DEFAULT_SPEC) -> List[State]:
+        # successors() with validity checks timed separately and GENERATE events
+        t0 = time.perf_counter()
+        out = successors(s, order=order, spec=spec, valid=self._valid)
+        self.phase_times["successors"] += time.perf_counter() - t0
+        for v in out:
+            self.emit(GENERATE, v)
+        return out
+
+    def _valid(self, k: StateKey, spec: ProblemSpec) -> bool:
+        t0 = time.perf_counter()
+        ok = is_valid_key(k, spec)
+        self.phase_times["validity"] += time.perf_counter() - t0
+        return ok
+
+    def report(self) -> dict:
+        return {"counts": dict(self.counts), "phase_times": dict(self.phase_times)}
+
+# -------- Ready-made subscribers --------
+class TraceRecorder:
+    """Keeps (kind, m_left, c_left, boat, g) tuples, up to `limit` of them."""
+
+    def __init__(self, limit: int = 100000):
+        self.limit = limit
+        self.events: List[Tuple[str, int, int, str, int]] = []
+
+    def __call__(self, kind: str, s: State):
+        if len(self.events) < self.limit:
+            k = s.key
+            self.events.append((kind, k.m_left, k.c_left, k.boat, s.g))
+
+class ProgressPrinter:
+    """Rewrites one status line on stderr every `every` expansions."""
+
+    def __init__(self, every: int = 1000, stream=None):
+        self.every = every
+        self.stream = stream or sys.stderr
+        self.expanded = 0
+
+    def __call__(self, kind: str, s: State):
+        if kind == EXPAND:
+            self.expanded += 1
+            if self.expanded % self.every == 0:
+                self.stream.write(f"\rexpanded={self.expanded} depth={s.g} at={s.key}")
+                self.stream.flush()
+        elif kind == GOAL:
+            self.stream.write(f"\rexpanded={self.expanded} goal at depth {s.g}\n")
+            self.stream.flush()
@@ -0,0 +1,108 @@
+# Pluggable admissible heuristics: closed-form bounds + pattern databases
+
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, Metrics, heuristic_trips_remaining, heuristic_round_trips
+from nodePool import pack_key, state_count
+from retrograde import get_distance_table
+
+# -------- Pattern databases --------
+def _relaxed_distances(spec: ProblemSpec, bank: str) -> array:
+    """Trip counts to the goal in the relaxed puzzle where only one bank
+    ('L' or 'R') has to stay safe, for every (m, c, boat) cell of the grid
+    (packed ids, -1 where the relaxed goal is unreachable). Every real move
+    is also a relaxed move, so these never overestimate."""
+    M, C = spec.total_m, spec.total_c
+    moves = spec.moves
+    if bank == 'L':
+        def ok(m, c):
+            return m == 0 or c <= m
+    else:
+        def ok(m, c):
+            return m == M or C - c <= M - m
+    dist = array('i', [-1]) * state_count(spec)
+    goal = pack_key(StateKey(0, 0, 'R'), spec)
+    dist[goal] = 0
+    q = deque([goal])
+    while q:
+        u = q.popleft()
+        du = dist[u] + 1
+        mc, right = u >> 1, u & 1
+        m, c = divmod(mc, C + 1)
+        # relaxed moves are reversible too: the boat leaves u's side
+        sign = 1 if right else -1
+        for dm, dc in moves:
+            m2, c2 = m + sign * dm, c + sign * dc
+            if 0 <= m2 <= M and 0 <= c2 <= C and ok(m2, c2):
+                v = (m2 * (C + 1) + c2) * 2 + (1 - right)
+                if dist[v] < 0:
+                    dist[v] = du
+                    q.append(v)
+    return dist
+
+class PatternDB:
+    """max() of the left-bank-only and right-bank-only relaxations, one int32
+    per grid cell indexed by packed id. Both relaxations are BFS distances of
+    supersets of the real move graph, so the max is admissible and
+    consistent. Building it visits the whole (M+1) x (C+1) x 2 grid rather
+    than the thin band of valid states, so it pays off when the same spec is
+    searched many times."""
+
+    def __init__(self, spec: ProblemSpec = DEFAULT_SPEC):
+        self.spec = spec
+        left = _relaxed_distances(spec, 'L')
+        right = _relaxed_distances(spec, 'R')
+        # -1 in one relaxation: the cell breaks that bank's rule (an unsafe
+        # start) or is a dead end; the other relaxation still bounds it
+        self.h = array('i', map(max, left, right))
+
+    def __call__(self, k: StateKey, spec: Optional[ProblemSpec] = None) -> int:
+        # same call shape as heuristic_trips_remaining(k, spec)
+        h = self.h[pack_key(k, self.spec)]
+        return h if h >= 0 else heuristic_round_trips(k, self.spec)
+
+@lru_cache(maxsize=None)
+def _pattern_db(spec: ProblemSpec) -> PatternDB:
+    return PatternDB(spec)
+
+def get_pattern_db(spec: ProblemSpec = DEFAULT_SPEC) -> PatternDB:
+    """The shared PatternDB of spec, built on first use."""
+    return _pattern_db(spec)
+
+# -------- Registry --------
+# name -> factory(spec) returning an h(k, spec) callable; from weakest to exact
+HEURISTICS: Dict[str, Callable[[ProblemSpec], Callable]] = {
+    "trips": lambda spec: heuristic_trips_remaining,
+    "round-trips": lambda spec: heuristic_round_trips,
+    "pdb": get_pattern_db,
+    "perfect": get_distance_table,
+}
+
+def resolve_heuristic(heuristic, spec: ProblemSpec = DEFAULT_SPEC) -> Callable:
+    """Solvers' heuristic= argument: a registry name or an h(k, spec) callable."""
+    if callable(heuristic):
+        return heuristic
+    try:
+        return HEURISTICS[heuristic](spec)
+    except KeyError:
+        raise ValueError(f"unknown heuristic {heuristic!r}; expected one of {sorted(HEURISTICS)}") from None
+
+def compare_heuristics(solver_fn, cases: List[Tuple[str, StateKey]], *, names=("trips", "round-trips", "pdb", "perfect"), spec: ProblemSpec = DEFAULT_SPEC):
+    """Run solver_fn once per (case, heuristic) and print the expansions each
+    heuristic saved relative to the first one in `names`.
+    Returns {case_name: {heuristic: expanded}}."""
+    print("\nCase\t" + "\t".join(names) + "\tSaved(" + "/".join(names[1:]) + ")")
+    table = {}
+    for case_name, start in cases:
+        row = {}
+        for name in names:
+            metr = Metrics()
+            solver_fn(start, metr, spec=spec, heuristic=name)
+            row[name] = metr.expanded
+        base = row[names[0]]
+        saved = "/".join(str(base - row[n]) for n in names[1:])
+        print(f"{case_name}\t" + "\t".join(str(row[n]) for n in names) + f"\t{saved}")
+        table[case_name] = row
+    return table
@@ -0,0 +1,106 @@
+# Load test for solverService: throughput and latency percentiles
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+from allItem import ProblemSpec, StateKey, _percentile
+from stateGraph import get_graph
+from solverClient import AsyncSolverClient, ServiceError
+
+async def _client(conn: dict, starts: List[StateKey], spec: ProblemSpec, ops: List[str], n: int, inflight: int, rng: random.Random, lat: List[float], errors: List[str]):
+    cl = await AsyncSolverClient.connect(**conn)
+    sem = asyncio.Semaphore(inflight)
+
+    async def one():
+        async with sem:
+            start = rng.choice(starts)
+            op = rng.choice(ops)
+            t0 = time.perf_counter()
+            try:
+                if op == "optimal":
+                    await cl.optimal(start, spec=spec)
+                else:
+                    await cl.solve(start, algo=op, spec=spec, path=False)
+            except ServiceError as e:
+                errors.append(str(e))
+                return
+            lat.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    await cl.close()
+
+async def run_load(conn: dict, *, spec: ProblemSpec, ops: List[str], clients: int, requests: int, inflight: int, seed: int = 0) -> dict:
+    """`clients` connections, each sending `requests` requests with up to
+    `inflight` outstanding; starts are drawn from spec's valid states."""
+    starts = list(get_graph(spec).keys[:get_graph(spec).n_valid])
+    rng = random.Random(seed)
+    lat: List[float] = []
+    errors: List[str] = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(conn, starts, spec, ops, requests, inflight, random.Random(rng.random()), lat, errors) for _ in range(clients)))
+    wall = time.perf_counter() - t0
+    stats_cl = await AsyncSolverClient.connect(**conn)
+    stats = await stats_cl.stats()
+    await stats_cl.close()
+    lat.sort()
+    pct = {f"p{int(q * 100)}": _percentile(lat, q) * 1000 for q in (0.5, 0.95, 0.99)} if lat else {}
+    return {"requests": len(lat) + len(errors), "errors": len(errors), "wall": wall, "throughput": len(lat) / wall if wall else 0.0, "latency_ms": dict(pct, max=(lat[-1] * 1000 if lat else None)), "server": stats}
+
+def _spawn(workers: Optional[int], threads: bool):
+    # private server on a temp unix socket, for one-command runs
+    sock = os.path.join(tempfile.mkdtemp(), "solver.sock")
+    cmd = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "solverService.py"), "--unix", sock]
+    if workers:
+        cmd += ["--workers", str(workers)]
+    if threads:
+        cmd.append("--threads")
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()   # "listening on ..." once warm
+    return proc, sock
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure solverService throughput and latency.")
+    ap.add_argument("--unix", default=None, help="service unix socket")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=None)
+    ap.add_argument("--spawn", action="store_true", help="start a private service for the run")
+    ap.add_argument("--workers", type=int, default=None, help="pool size of a --spawn service")
+    ap.add_argument("--threads", action="store_true", help="--spawn a thread-pool service")
+    ap.add_argument("--ops", default="bfs,astar,optimal", help="comma-separated mix of solver names and 'optimal'")
+    ap.add_argument("--spec", type=int, nargs=3, default=(3, 3, 2), metavar=("M", "C", "CAP"))
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=200, help="requests per client")
+    ap.add_argument("--inflight", type=int, default=4, help="outstanding requests per client")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    proc = sock = None
+    if args.spawn:
+        proc, sock = _spawn(args.workers, args.threads)
+        conn = {"unix": sock}
+    elif args.unix:
+        conn = {"unix": args.unix}
+    else:
+        from solverService import DEFAULT_PORT
+        conn = {"host": args.host, "port": args.port or DEFAULT_PORT}
+    try:
+        r = asyncio.run(run_load(conn, spec=ProblemSpec(*args.spec), ops=[o.strip() for o in args.ops.split(",") if o.strip()], clients=args.clients, requests=args.requests, inflight=args.inflight, seed=args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()   # the service shuts its pool down on SIGTERM
+            proc.wait()
+            shutil.rmtree(os.path.dirname(sock), ignore_errors=True)
+    lat = r["latency_ms"]
+    print(f"requests={r['requests']} errors={r['errors']} wall={r['wall']:.3f}s throughput={r['throughput']:.1f} req/s")
+    if lat:
+        print(f"latency ms: p50={lat['p50']:.3f} p95={lat['p95']:.3f} p99={lat['p99']:.3f} max={lat['max']:.3f}")
+    print("server:", " ".join(f"{k}={v}" for k, v in r["server"].items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Compact node store: states packed into ints, parents/moves in flat arrays
+
+from array import array
+from typing import List, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey
+
+# -------- State Packing --------
+# (m_left, c_left, boat) -> ((m_left * (TOTAL_C+1)) + c_left) * 2 + (boat == 'R')
+# so ordering by id matches the (m_left, c_left, boat) sort used by successors()
+def pack_key(k: StateKey, spec: ProblemSpec = DEFAULT_SPEC) -> int:
+    return (k.m_left * (spec.total_c + 1) + k.c_left) * 2 + (1 if k.boat == 'R' else 0)
+
+def unpack_id(sid: int, spec: ProblemSpec = DEFAULT_SPEC) -> StateKey:
+    m, c = divmod(sid >> 1, spec.total_c + 1)
+    return StateKey(m, c, 'R' if sid & 1 else 'L')
+
+def state_count(spec: ProblemSpec = DEFAULT_SPEC) -> int:
+    return (spec.total_m + 1) * (spec.total_c + 1) * 2
+
+def band(spec: ProblemSpec = DEFAULT_SPEC) -> Tuple[array, array]:
+    """Valid states as a band of the (m, c) grid: c_lo[m] is the lowest valid
+    c_left of column m and col_off[m] the number of valid (m, c) cells in
+    the columns before it, so col_off[M + 1] counts them all. The dense id
+    of a valid state is (col_off[m] + c - c_lo[m]) * 2 + (boat == 'R'),
+    which is how StateGraph numbers its nodes."""
+    M, C = spec.total_m, spec.total_c
+    c_lo = array('i', [0]) * (M + 1)
+    col_off = array('i', [0]) * (M + 2)
+    # c <= m unless m == 0, and C-c <= M-m unless m == M
+    for m in range(M + 1):
+        lo = 0 if m == M else max(0, C - M + m)
+        hi = C if m == 0 else min(C, m)
+        c_lo[m] = lo
+        col_off[m + 1] = col_off[m] + max(0, hi - lo + 1)
+    return c_lo, col_off
+
+def valid_mc(m: int, c: int, spec: ProblemSpec = DEFAULT_SPEC) -> bool:
+    # is_valid_key() without building a StateKey
+    if not (0 <= m <= spec.total_m and 0 <= c <= spec.total_c):
+        return False
+    if m > 0 and c > m:
+        return False
+    m_right = spec.total_m - m
+    if m_right > 0 and spec.total_c - c > m_right:
+        return False
+    return True
+
+def expand_id(sid: int, spec: ProblemSpec = DEFAULT_SPEC) -> List[Tuple[int,int]]:
+    """Valid (child_id, move_idx) pairs, in the same order as
+    successors(order="deterministic")."""
+    stride = spec.total_c + 1
+    m, c = divmod(sid >> 1, stride)
+    if sid & 1:
+        sign, nb = 1, 0
+    else:
+        sign, nb = -1, 1
+    out = []
+    for i, (dm, dc) in enumerate(spec.moves):
+        m2 = m + sign * dm
+        c2 = c + sign * dc
+        if valid_mc(m2, c2, spec):
+            out.append(((m2 * stride + c2) * 2 + nb, i))
+    out.sort()
+    return out
+
+# -------- Node Pool --------
+class PoolNode:
+    """Handle to one slot of a NodePool (or any store exposing key_of / g /
+    path_keys); stands in for a goal State."""
+    __slots__ = ("pool", "slot")
+
+    def __init__(self, pool: "NodePool", slot: int):
+        self.pool = pool
+        self.slot = slot
+
+    @property
+    def key(self) -> StateKey:
+        return self.pool.key_of(self.slot)
+
+    @property
+    def g(self) -> int:
+        return self.pool.g[self.slot]
+
+class NodePool:
+    """One slot per distinct state reached, stored column-wise in typed arrays.
+    Parents are slot numbers, moves are indices into spec.moves, so memory
+    grows per distinct state instead of per generated State object.
+
+    Slots are found through `slots`, preallocated over the dense ids of the
+    valid states (see band()), so lookups never leave typed buffers. An
+    unsafe start gets a slot but no entry: valid moves never lead back to it."""
+
+    def __init__(self, spec: ProblemSpec = DEFAULT_SPEC):
+        self.spec = spec
+        self._stride = spec.total_c + 1
+        self._c_lo, self._col_off = band(spec)
+        self.slots = array('i', [-1]) * (2 * self._col_off[-1])   # dense id -> slot
+        self.ids = array('q')             # slot -> packed id
+        self.parent = array('i')          # slot -> parent slot (-1 for the root)
+        self.move = array('h')            # slot -> move index (-1 for the root)
+        self.g = array('i')               # slot -> depth / best g
+        self.closed = bytearray()         # slot -> expanded flag
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def find(self, sid: int) -> int:
+        """Slot of a valid state's packed id, -1 if not reached yet."""
+        m, c = divmod(sid >> 1, self._stride)
+        return self.slots[(self._col_off[m] + c - self._c_lo[m]) * 2 + (sid & 1)]
+
+    def add(self, sid: int, parent: int, move_idx: int, g: int) -> int:
+        slot = len(self.ids)
+        m, c = divmod(sid >> 1, self._stride)
+        if valid_mc(m, c, self.spec):
+            self.slots[(self._col_off[m] + c - self._c_lo[m]) * 2 + (sid & 1)] = slot
+        self.ids.append(sid)
+        self.parent.append(parent)
+        self.move.append(move_idx)
+        self.g.append(g)
+        self.closed.append(0)
+        return slot
+
+    def relink(self, slot: int, parent: int, move_idx: int, g: int):
+        # cheaper path found to an existing slot
+        self.parent[slot] = parent
+        self.move[slot] = move_idx
+        self.g[slot] = g
+
+    def key_of(self, slot: int) -> StateKey:
+        return unpack_id(self.ids[slot], self.spec)
+
+    def expand(self, slot: int) -> List[Tuple[int,int]]:
+        return expand_id(self.ids[slot], self.spec)
+
+    def node(self, slot: int) -> PoolNode:
+        return PoolNode(self, slot)
+
+    def path_slots(self, slot: int) -> List[int]:
+        seq = []
+        while slot >= 0:
+            seq.append(slot)
+            slot = self.parent[slot]
+        seq.reverse()
+        return seq
+
+    def path_keys(self, slot: int) -> List[StateKey]:
+        return [unpack_id(self.ids[i], self.spec) for i in self.path_slots(slot)]
+
+# -------- Plain Key Paths --------
+class KeyPath:
+    """A finished start→goal path as plain StateKeys, for solvers that don't
+    keep a search tree; PoolNode(path, len(path)-1) is its goal handle."""
+
+    def __init__(self, keys: List[StateKey]):
+        self.keys = keys
+        self.g = range(len(keys))   # depth of position i is i
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def key_of(self, pos: int) -> StateKey:
+        return self.keys[pos]
+
+    def node(self, pos: int) -> PoolNode:
+        return PoolNode(self, pos)
+
+    def path_keys(self, pos: int) -> List[StateKey]:
+        return self.keys[:pos + 1]
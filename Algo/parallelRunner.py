@@ -0,0 +1,84 @@
+# Process-pool benchmark runner: (algorithm x case x repeat) jobs in parallel
+
+import argparse
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from allItem import ProblemSpec, StateKey, run_single, summarize_case, print_summary, default_optimal
+from solveCache import open_cache
+from data import TEST_CASES
+import StephanieLo, VictorYangMingHan, YeapYongJin, ChanYiHerng, HamGuanQuan
+
+# (name, solver, repeats) as each module's menu runs them; solvers must be
+# module-level functions so they can be pickled to worker processes
+ALGORITHMS = [
+    (StephanieLo.ALGO_NAME, StephanieLo.bfs_solver, 1),
+    (VictorYangMingHan.ALGO_NAME, VictorYangMingHan.dfs_solver, 1),
+    (YeapYongJin.ALGO_NAME, YeapYongJin.astar_solver, 1),
+    (ChanYiHerng.ALGO_NAME, ChanYiHerng.greedy_solver, 1),
+    (HamGuanQuan.ALGO_NAME, HamGuanQuan.sa_solver, 20),
+]
+
+def job_seed(seed: int, algo_name: str, case_name: str, r: int) -> str:
+    # str seeds are hashed with SHA-512 by random.seed, so every job gets the
+    # same RNG stream whichever worker runs it and in whatever order
+    return f"{seed}/{algo_name}/{case_name}/{r}"
+
+def _run_job(job):
+    solver_fn, algo_name, start, spec, seed_key, cache_path = job
+    # run_single reseeds `random`; the seed is also part of the cache key
+    # for randomized solvers
+    cache = open_cache(cache_path) if cache_path else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_single(solver_fn, start, algo_name, animate=False, spec=spec, seed=seed_key, cache=cache)
+
+def run_sweep(algos, cases: List[Tuple[str, StateKey]], *, optimal_by_case: Optional[Dict[str, Optional[int]]] = None, spec: Optional[ProblemSpec] = None, workers: Optional[int] = None, seed: int = 0, cache_path: Optional[str] = None):
+    """Run every (algorithm, case, repeat) job across a process pool and print
+    one run_all_extended-style table per algorithm. Results are merged in job
+    order, so the tables only depend on `seed`, not on scheduling.
+    workers=1 runs in-process. cache_path names a shared solveCache file.
+    Returns {algo_name: rows}."""
+    if optimal_by_case is None:
+        optimal_by_case = default_optimal(cases, spec)
+    jobs = []
+    for algo_name, solver_fn, repeats in algos:
+        for case_name, start in cases:
+            for r in range(repeats):
+                jobs.append((solver_fn, algo_name, start, spec, job_seed(seed, algo_name, case_name, r), cache_path))
+    if workers == 1:
+        results = [_run_job(j) for j in jobs]
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_run_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    tables = {}
+    pos = 0
+    for algo_name, solver_fn, repeats in algos:
+        rows = []
+        for case_name, start in cases:
+            rows.append(summarize_case(case_name, results[pos:pos + repeats], optimal_by_case.get(case_name)))
+            pos += repeats
+        print(f"\n[{algo_name}] Run ALL test cases (repeats={repeats})")
+        print_summary(rows)
+        tables[algo_name] = rows
+    return tables
+
+def run_all_parallel(solver_fn, cases: List[Tuple[str, StateKey]], *, algo_name: str, optimal_by_case: Optional[Dict[str, Optional[int]]] = None, repeats: int = 1, spec: Optional[ProblemSpec] = None, workers: Optional[int] = None, seed: int = 0, cache_path: Optional[str] = None):
+    """Drop-in parallel counterpart of run_all_extended for one algorithm."""
+    return run_sweep([(algo_name, solver_fn, repeats)], cases, optimal_by_case=optimal_by_case, spec=spec, workers=workers, seed=seed, cache_path=cache_path)[algo_name]
+
+def main():
+    ap = argparse.ArgumentParser(description="Run every solver over data.TEST_CASES in parallel.")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count; 1 = in-process)")
+    ap.add_argument("--seed", type=int, default=0, help="base seed for the randomized solvers")
+    ap.add_argument("--cache", default=None, help="sqlite file of solved (spec, start, algorithm, seed) jobs to reuse")
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    run_sweep(ALGORITHMS, TEST_CASES, workers=args.workers, seed=args.seed, cache_path=args.cache)
+    print(f"\nWall-clock: {time.perf_counter() - t0:.3f}s")
+
+if __name__ == "__main__":
+    main()
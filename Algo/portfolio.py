@@ -0,0 +1,207 @@
+#Portfolio: race several solvers in worker processes, keep the first answer
+
+import multiprocessing as mp
+import queue as _queue
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from allItem import ProblemSpec, StateKey, Metrics, reconstruct_path, run_single, _call_solver
+from nodePool import KeyPath
+from retrograde import optimal_lengths
+from data import TEST_CASES
+import StephanieLo, VictorYangMingHan, YeapYongJin, ChanYiHerng, HamGuanQuan
+
+ALGO_NAME = "Portfolio"
+
+# (name, solver, proven optimal); solvers must be module-level functions so
+# they can be pickled to worker processes
+PORTFOLIO = [
+    (StephanieLo.ALGO_NAME, StephanieLo.bfs_solver, True),
+    (VictorYangMingHan.ALGO_NAME, VictorYangMingHan.dfs_solver, False),
+    (YeapYongJin.ALGO_NAME, YeapYongJin.astar_solver, True),
+    (ChanYiHerng.ALGO_NAME, ChanYiHerng.greedy_solver, False),
+    (HamGuanQuan.ALGO_NAME, HamGuanQuan.sa_solver, False),
+]
+
+CHECK_EVERY = 256  # expansions between checks of the stop flag
+POLL = 0.05        # seconds between checks for workers that died silently
+
+class _Cancelled(Exception):
+    pass
+
+class _RaceMetrics(Metrics):
+    """Metrics whose bump() gives up once another solver has won, so a
+    cancelled worker can still send back its partial counts."""
+
+    def __init__(self, stop):
+        super().__init__()
+        self._stop = stop
+
+    def bump(self):
+        self.expanded += 1
+        if self.expanded % CHECK_EVERY == 0 and self._stop.is_set():
+            raise _Cancelled
+
+def _race_worker(name, solver_fn, start, spec, seed_key, stop, out):
+    random.seed(seed_key)
+    metr = _RaceMetrics(stop)
+    t0 = time.perf_counter()
+    error = None
+    try:
+        goal = _call_solver(solver_fn, start, metr, spec)
+        keys = reconstruct_path(goal) if goal is not None else None
+        status = "finished" if keys else "failed"
+    except _Cancelled:
+        keys, status = None, "cancelled"
+    except Exception as e:  # report it, or race() would wait for this worker forever
+        keys, status, error = None, "error", f"{type(e).__name__}: {e}"
+    out.put((name, status, keys, metr.expanded, metr.max_frontier, time.perf_counter() - t0, error))
+
+@dataclass
+class RaceResult:
+    """winner is the name of the solver whose path was kept (None if no
+    solver reached the goal). status[name] is one of won / finished /
+    failed / cancelled / error / died / killed, and parts[name] holds the
+    Metrics each worker had reached when it stopped (empty if it died or
+    had to be killed). errors[name] says what went wrong for error / died."""
+    winner: Optional[str]
+    goal: object
+    time: float
+    status: Dict[str, str] = field(default_factory=dict)
+    parts: Dict[str, Metrics] = field(default_factory=dict)
+    times: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+def race(start: StateKey, *, solvers=PORTFOLIO, optimal: bool = False, spec: Optional[ProblemSpec] = None, seed: int = 0, grace: float = 1.0) -> RaceResult:
+    """Start every solver in its own process on `start` and return as soon as
+    one reaches the goal; with optimal=True only solvers flagged as proven
+    optimal may win. The others are told to stop and get `grace` seconds to
+    report their partial Metrics before they are terminated."""
+    ctx = mp.get_context()
+    stop = ctx.Event()
+    out = ctx.Queue()
+    procs = {}
+    for name, solver_fn, _ in solvers:
+        seed_key = f"{seed}/{name}"
+        procs[name] = ctx.Process(target=_race_worker, args=(name, solver_fn, start, spec, seed_key, stop, out), daemon=True)
+    can_win = {name for name, _, proven in solvers if proven or not optimal}
+    res = RaceResult(None, None, 0.0)
+    t0 = time.perf_counter()
+    for p in procs.values():
+        p.start()
+    pending = set(procs)
+
+    def collect(timeout=None) -> Optional[str]:
+        name, status, keys, expanded, frontier, dt, error = out.get(timeout=timeout)
+        pending.discard(name)
+        m = Metrics()
+        m.expanded, m.max_frontier = expanded, frontier
+        res.parts[name], res.status[name], res.times[name] = m, status, dt
+        if error:
+            res.errors[name] = error
+        if keys and res.winner is None and name in can_win:
+            res.winner, res.goal = name, KeyPath(keys).node(len(keys) - 1)
+            res.status[name] = "won"
+        return name
+
+    def poll():
+        # a worker killed from outside (OOM killer, segfault) never reports
+        try:
+            collect(POLL)
+            return
+        except _queue.Empty:
+            pass
+        dead = [name for name in pending if procs[name].exitcode is not None]
+        if not dead:
+            return
+        # anything a worker put before exiting is already in the pipe
+        try:
+            while pending:
+                collect(POLL)
+        except _queue.Empty:
+            pass
+        for name in dead:
+            if name in pending:
+                pending.discard(name)
+                res.parts[name], res.status[name] = Metrics(), "died"
+                res.errors[name] = f"exit code {procs[name].exitcode}"
+
+    try:
+        # every solver that could still win is running; if none is, no one can
+        while pending & can_win and res.winner is None:
+            poll()
+        res.time = time.perf_counter() - t0
+        stop.set()
+        deadline = time.perf_counter() + grace
+        while pending:
+            left = deadline - time.perf_counter()
+            if left <= 0:
+                break
+            try:
+                collect(left)
+            except _queue.Empty:
+                break
+    finally:
+        stop.set()
+        for name, p in procs.items():
+            if p.is_alive():
+                p.terminate()
+            p.join()
+        for name in pending:
+            res.parts[name], res.status[name] = Metrics(), "killed"
+    return res
+
+def portfolio_solver(start: StateKey, metr: Metrics, *, spec: Optional[ProblemSpec] = None, optimal: bool = False):
+    # solver-shaped wrapper; run_single prints the per-solver parts
+    res = race(start, optimal=optimal, spec=spec)
+    metr.parts = {f"{name.strip()} [{res.status[name]}]": m for name, m in res.parts.items()}
+    metr.expanded = sum(m.expanded for m in res.parts.values())
+    metr.max_frontier = max((m.max_frontier for m in res.parts.values()), default=0)
+    return res.goal
+
+def portfolio_optimal_solver(start: StateKey, metr: Metrics, *, spec: Optional[ProblemSpec] = None):
+    return portfolio_solver(start, metr, spec=spec, optimal=True)
+
+def run_all_race(cases: List[Tuple[str, StateKey]], *, optimal_by_case: Dict[str, Optional[int]], optimal: bool = False, spec: Optional[ProblemSpec] = None):
+    print(f"\n[{ALGO_NAME}] Race ALL test cases (optimal={optimal})")
+    print("\nCase\tWinner\tPath\tTime(s)\tGap\tStatus")
+    rows = []
+    for name, start in cases:
+        res = race(start, optimal=optimal, spec=spec)
+        plen = len(reconstruct_path(res.goal)) - 1 if res.goal else None
+        opt = optimal_by_case.get(name)
+        gap = plen - opt if plen is not None and opt is not None else None
+        status = ", ".join(f"{n.strip()}={s}" for n, s in res.status.items())
+        print(f"{name}\t{res.winner}\t{plen}\t{res.time:.6f}\t{gap}\t{status}")
+        rows.append((name, res))
+    return rows
+
+def main():
+    optimal = optimal_lengths(TEST_CASES)
+    need_optimal = False
+    while True:
+        print(f"\n=== {ALGO_NAME} Menu (optimal={need_optimal}) ===")
+        print("1) Choose ONE test case → animate + show metrics")
+        print("2) Race ALL test cases (no animation) → winner table")
+        print("3) Toggle proven-optimal mode")
+        print("0) Exit")
+        sel = input("Select: ").strip()
+        solver = portfolio_optimal_solver if need_optimal else portfolio_solver
+        if sel == "1":
+            for i,(name, s) in enumerate(TEST_CASES,1):
+                print(f"{i}) {name}: start={s}")
+            idx = int(input("Pick one: ").strip()) - 1
+            name, start = TEST_CASES[idx]
+            run_single(solver, start, ALGO_NAME, animate=True, anim_speed=0.6)
+        elif sel == "2":
+            run_all_race(TEST_CASES, optimal_by_case=optimal, optimal=need_optimal)
+        elif sel == "3":
+            need_optimal = not need_optimal
+        elif sel == "0":
+            break
+        else:
+            print("Invalid selection.")
+
+if __name__ == "__main__":
+    main()
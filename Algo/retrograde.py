@@ -0,0 +1,113 @@
+# Retrograde distance-to-goal table: one reverse BFS from (0,0,'R') per spec
+
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, Metrics
+from nodePool import PoolNode, pack_key, expand_id
+from stateGraph import StateGraph, GraphTrace, get_graph, start_graph
+
+class DistanceTable:
+    """Optimal boat-trip count to the goal for every valid state.
+
+    Every move is reversible (same load, opposite direction), so a BFS from
+    the goal over the StateGraph gives exact distances for all starts at once.
+    dist[u] == -1 marks states that cannot reach the goal (all of them when
+    the spec has no valid goal state)."""
+
+    def __init__(self, spec: ProblemSpec = DEFAULT_SPEC, graph: Optional[StateGraph] = None):
+        self.spec = spec
+        self.graph = graph or get_graph(spec)
+        g = self.graph
+        n = g.n_valid
+        self.dist = array('i', [-1]) * n
+        offsets, targets, dist = g.offsets, g.targets, self.dist
+        q = deque()
+        if g.goal_id is not None:
+            dist[g.goal_id] = 0
+            q.append(g.goal_id)
+        while q:
+            u = q.popleft()
+            du = dist[u] + 1
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if v < n and dist[v] < 0:
+                    dist[v] = du
+                    q.append(v)
+        # upper bound on any finite distance; used as h() for dead states
+        self.unreachable = n
+
+    def distance(self, k: StateKey) -> Optional[int]:
+        """Optimal trip count from k, or None if the goal is unreachable."""
+        u = self.graph.id_of(k)
+        if u is not None and u < len(self.dist):
+            d = self.dist[u]
+            return d if d >= 0 else None
+        # unsafe (but in-bounds) start: one step onto the graph
+        best = None
+        if 0 <= k.m_left <= self.spec.total_m and 0 <= k.c_left <= self.spec.total_c:
+            for v, _ in expand_id(pack_key(k, self.spec), self.spec):
+                dv = self.dist[self.graph.index[v]]
+                if dv >= 0 and (best is None or dv + 1 < best):
+                    best = dv + 1
+        return best
+
+    def __call__(self, k: StateKey, spec: Optional[ProblemSpec] = None) -> int:
+        # perfect heuristic, same call shape as heuristic_trips_remaining(k, spec)
+        d = self.distance(k)
+        return self.unreachable if d is None else d
+
+    def best_move(self, u: int, want: Optional[int] = None, graph: Optional[StateGraph] = None) -> int:
+        """Edge index out of dense id u that lowers the distance by one
+        (first in successor order), or -1 at the goal / dead states. Pass
+        the start_graph() copy as graph for an unsafe start's extra node."""
+        g, dist = graph or self.graph, self.dist
+        if want is None:
+            want = dist[u] - 1
+        for e in range(g.offsets[u], g.offsets[u + 1]):
+            if dist[g.targets[e]] == want:
+                return e
+        return -1
+
+    def optimal_path(self, start: StateKey) -> Optional[PoolNode]:
+        """Walk down the table from start: an optimal path in O(path) steps,
+        returned as a goal handle for reconstruct_path/play_animation."""
+        d = self.distance(start)
+        if d is None:
+            return None
+        g, u = start_graph(start, self.spec)
+        trace = GraphTrace(g, u)
+        pos = 0
+        if u >= len(self.dist):
+            # unsafe start: step onto the graph first
+            e = self.best_move(u, d - 1, g)
+            u = g.targets[e]
+            pos = trace.step(u, g.labels[e])
+        while not g.goal[u]:
+            e = self.best_move(u)
+            u = g.targets[e]
+            pos = trace.step(u, g.labels[e])
+        return trace.node(pos)
+
+@lru_cache(maxsize=None)
+def _table(spec: ProblemSpec) -> DistanceTable:
+    return DistanceTable(spec)
+
+def get_distance_table(spec: ProblemSpec = DEFAULT_SPEC) -> DistanceTable:
+    """The shared DistanceTable of spec: one reverse BFS per process."""
+    return _table(spec)
+
+def optimal_lengths(cases: List[Tuple[str, StateKey]], spec: ProblemSpec = DEFAULT_SPEC) -> Dict[str, Optional[int]]:
+    """Optimal trip count per named case, for run_all_extended's Gap column."""
+    table = get_distance_table(spec)
+    return {name: table.distance(s) for name, s in cases}
+
+def retrograde_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC):
+    # no search: read an optimal path straight out of the distance table
+    table = get_distance_table(spec)
+    goal = table.optimal_path(start)
+    if goal is not None:
+        metr.expanded += goal.g + 1   # states read along the path
+        metr.track_frontier(1)
+    return goal
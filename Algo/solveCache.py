@@ -0,0 +1,154 @@
+# Solve cache: (spec, start, algorithm[, seed]) -> run_single result + path
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey
+
+# solvers whose result depends on the RNG: only cached when given a seed
+RANDOMIZED = {
+    "VictorYangMingHan.dfs_solver",
+    "VictorYangMingHan.dfs_solver_graph",
+    "ChanYiHerng.greedy_solver",
+    "ChanYiHerng.greedy_solver_graph",
+    "HamGuanQuan.sa_solver",
+    "HamGuanQuan.sa_solver_graph",
+    "HamGuanQuan.sa_batch_solver",
+    # the winner depends on process scheduling, so never reproducible
+    "portfolio.portfolio_solver",
+    "portfolio.portfolio_optimal_solver",
+}
+UNSEEDABLE = {"portfolio.portfolio_solver", "portfolio.portfolio_optimal_solver"}
+
+# Bump when the key or entry layout changes.
+SCHEMA_VERSION = 1
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the solver sources (every .py next to this module), part of
+    every key: results recorded by other code never match."""
+    h = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        with open(path, "rb") as f:
+            h.update(os.path.basename(path).encode() + b"\0" + f.read())
+    return h.hexdigest()[:16]
+
+def solver_id(solver_fn) -> Optional[str]:
+    """module.qualname of a module-level solver; None for lambdas and
+    closures, whose behaviour can't be told apart by name."""
+    name = getattr(solver_fn, "__qualname__", None)
+    mod = getattr(solver_fn, "__module__", None)
+    if not name or not mod or "<" in name:
+        return None
+    if mod == "__main__":
+        # a solver module run as a script: key it by its file name
+        import __main__
+        mod = os.path.splitext(os.path.basename(getattr(__main__, "__file__", "") or ""))[0] or mod
+    return f"{mod}.{name}"
+
+class SolveCache:
+    """Bounded in-memory LRU in front of an optional sqlite file.
+
+    Entries are (result dict, path keys) as produced by run_single; a key
+    is the spec, the start state, the solver's module.qualname and the seed.
+    Randomized solvers (RANDOMIZED) are skipped unless a seed is given.
+    Keys also carry SCHEMA_VERSION and code_version(), and opening a file
+    written by other code empties it. Results keep the time / peak_kb of
+    the run that stored them; callers flag hits as "cached".
+    The file is safe to share between the worker processes of a sweep."""
+
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self._lru: "OrderedDict[str, Tuple[dict, List[StateKey]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30.0)
+            with self._db:
+                self._db.execute("CREATE TABLE IF NOT EXISTS solves (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                version = f"{SCHEMA_VERSION}/{code_version()}"
+                row = self._db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+                if row is None or row[0] != version:
+                    # stale results could never be hit again; drop them
+                    self._db.execute("DELETE FROM solves")
+                    self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (version,))
+
+    def key(self, solver_fn, start: StateKey, spec: Optional[ProblemSpec] = None, seed=None) -> Optional[str]:
+        """Cache key, or None if this call must not be cached."""
+        sid = solver_id(solver_fn)
+        if sid is None or sid in UNSEEDABLE or (sid in RANDOMIZED and seed is None):
+            return None
+        spec = spec or DEFAULT_SPEC
+        return json.dumps([SCHEMA_VERSION, code_version(), spec.total_m, spec.total_c, spec.capacity, start.m_left, start.c_left, start.boat, sid, None if sid not in RANDOMIZED else str(seed)])
+
+    def get(self, key: Optional[str]) -> Optional[Tuple[dict, List[StateKey]]]:
+        if key is None:
+            return None
+        hit = self._lru.get(key)
+        if hit is not None:
+            self._lru.move_to_end(key)
+        elif self._db is not None:
+            row = self._db.execute("SELECT value FROM solves WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                hit = self._decode(row[0])
+                self._remember(key, hit)
+        if hit is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return hit
+
+    def put(self, key: Optional[str], result: dict, path: List[StateKey]):
+        if key is None:
+            return
+        entry = (result, list(path))
+        self._remember(key, entry)
+        if self._db is not None:
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO solves (key, value) VALUES (?, ?)", (key, self._encode(entry)))
+
+    def clear(self):
+        self._lru.clear()
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM solves")
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def _remember(self, key: str, entry):
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    @staticmethod
+    def _encode(entry) -> str:
+        result, path = entry
+        return json.dumps({"result": result, "path": [[k.m_left, k.c_left, k.boat] for k in path]})
+
+    @staticmethod
+    def _decode(text: str):
+        d = json.loads(text)
+        return d["result"], [StateKey(m, c, b) for m, c, b in d["path"]]
+
+@lru_cache(maxsize=None)
+def _cache(path: Optional[str], maxsize: int) -> SolveCache:
+    return SolveCache(maxsize, path)
+
+def open_cache(path: Optional[str] = None, maxsize: int = 1024) -> SolveCache:
+    """One SolveCache per path and process (path=None: memory only)."""
+    return _cache(path, maxsize)
@@ -0,0 +1,132 @@
+# Clients for solverService: blocking (SolverClient) and asyncio (AsyncSolverClient)
+
+import asyncio
+import itertools
+import json
+import socket
+from typing import Dict, Optional
+from allItem import ProblemSpec, StateKey
+from solverService import DEFAULT_PORT
+
+class ServiceError(RuntimeError):
+    pass
+
+def _request(op: str, start: Optional[StateKey] = None, spec: Optional[ProblemSpec] = None, **extra) -> dict:
+    req = {"op": op}
+    if start is not None:
+        req["start"] = [start.m_left, start.c_left, start.boat]
+    if spec is not None:
+        req["spec"] = [spec.total_m, spec.total_c, spec.capacity]
+    req.update({k: v for k, v in extra.items() if v is not None})
+    return req
+
+def _unwrap(reply: dict) -> dict:
+    if not reply.get("ok"):
+        raise ServiceError(reply.get("error", "request failed"))
+    return reply
+
+class SolverClient:
+    """One request at a time over a blocking socket.
+
+        with SolverClient() as cl:
+            cl.solve(StateKey(3, 3, 'L'), algo="astar")["path_len"]"""
+
+    def __init__(self, *, unix: Optional[str] = None, host: str = "127.0.0.1", port: int = DEFAULT_PORT, timeout: Optional[float] = 60.0):
+        if unix:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(unix)
+        else:
+            self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._file = self._sock.makefile("rwb")
+        self._ids = itertools.count(1)
+
+    def call(self, req: dict) -> dict:
+        req["id"] = next(self._ids)
+        self._file.write((json.dumps(req) + "\n").encode())
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ServiceError("connection closed by the service")
+        return _unwrap(json.loads(line))
+
+    def solve(self, start: StateKey, *, algo: str = "bfs", spec: Optional[ProblemSpec] = None, path: bool = True, seed=None) -> dict:
+        return self.call(_request("solve", start, spec, algo=algo, path=path, seed=seed))
+
+    def optimal(self, start: StateKey, *, spec: Optional[ProblemSpec] = None, method: Optional[str] = None) -> Optional[int]:
+        return self.call(_request("optimal", start, spec, method=method))["optimal"]
+
+    def ping(self) -> bool:
+        return self.call({"op": "ping"})["ok"]
+
+    def stats(self) -> dict:
+        return self.call({"op": "stats"})["stats"]
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class AsyncSolverClient:
+    """Pipelined asyncio client: any number of requests may be in flight on
+    one connection; replies are matched back to callers by id."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader, self._writer = reader, writer
+        self._ids = itertools.count(1)
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._pump = asyncio.ensure_future(self._read_replies())
+
+    @classmethod
+    async def connect(cls, *, unix: Optional[str] = None, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> "AsyncSolverClient":
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _read_replies(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                fut = self._waiting.pop(reply.get("id"), None)
+                if fut is not None and not fut.done():
+                    fut.set_result(reply)
+        finally:
+            for fut in self._waiting.values():
+                if not fut.done():
+                    fut.set_exception(ServiceError("connection closed by the service"))
+            self._waiting.clear()
+
+    async def call(self, req: dict) -> dict:
+        rid = req["id"] = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting[rid] = fut
+        self._writer.write((json.dumps(req) + "\n").encode())
+        await self._writer.drain()
+        return _unwrap(await fut)
+
+    async def solve(self, start: StateKey, *, algo: str = "bfs", spec: Optional[ProblemSpec] = None, path: bool = True, seed=None) -> dict:
+        return await self.call(_request("solve", start, spec, algo=algo, path=path, seed=seed))
+
+    async def optimal(self, start: StateKey, *, spec: Optional[ProblemSpec] = None, method: Optional[str] = None) -> Optional[int]:
+        return (await self.call(_request("optimal", start, spec, method=method)))["optimal"]
+
+    async def stats(self) -> dict:
+        return (await self.call({"op": "stats"}))["stats"]
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._pump.cancel()
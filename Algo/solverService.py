@@ -0,0 +1,257 @@
+# Long-running solver service: newline-delimited JSON over a unix socket or TCP
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, optimal_length_baseline
+from retrograde import get_distance_table
+from stateGraph import get_graph
+from solveCache import SolveCache, RANDOMIZED, solver_id
+from batchSolve import SOLVERS, solve_one
+
+# Protocol: one JSON object per line each way, answered out of order and
+# matched by "id".
+#   {"id": 1, "op": "solve", "algo": "bfs", "start": [3, 3, "L"],
+#    "spec": [3, 3, 2], "path": true, "seed": 7}
+#   {"id": 2, "op": "optimal", "start": [3, 3, "L"], "spec": [3, 3, 2]}
+#   {"id": 3, "op": "ping"} / {"id": 4, "op": "stats"}
+# Replies are {"id": .., "ok": true, ...} or {"id": .., "ok": false, "error": ..};
+# a solve answered from the cache says "cached": true (its time is the
+# original run's).
+# "spec" defaults to DEFAULT_SPEC; optional "method": "baseline" answers
+# "optimal" with one optimal_length_baseline search per start instead of
+# the shared retrograde table.
+
+DEFAULT_PORT = 8765
+
+# -------- Worker-side jobs (module level so process pools can pickle them) --------
+# Randomized solvers draw from the process-wide `random` module, which
+# solve_one reseeds; under a thread pool they take turns, or a seeded solve
+# would depend on what the other threads drew meanwhile (and be cached so).
+# Process pool workers run one job at a time, so the lock is never contended.
+_RANDOM_LOCK = threading.Lock()
+
+def _solve_job(algo: str, spec: ProblemSpec, start: StateKey, seed) -> Tuple[dict, List[list]]:
+    if solver_id(SOLVERS[algo]) in RANDOMIZED:
+        with _RANDOM_LOCK:
+            res, path = solve_one(SOLVERS[algo], start, spec=spec, seed=seed)
+    else:
+        res, path = solve_one(SOLVERS[algo], start, spec=spec, seed=seed)
+    return res, [[k.m_left, k.c_left, k.boat] for k in path]
+
+def _optimal_batch(spec: ProblemSpec, starts: List[StateKey], method: str) -> List[Optional[int]]:
+    # one reverse BFS (kept warm per worker) answers every start of the spec
+    if method == "baseline":
+        return [optimal_length_baseline(s, spec) for s in starts]
+    table = get_distance_table(spec)
+    return [table.distance(s) for s in starts]
+
+def _warm(spec: ProblemSpec) -> int:
+    get_graph(spec)
+    get_distance_table(spec)
+    return os.getpid()
+
+def _parse_spec(req: dict) -> ProblemSpec:
+    s = req.get("spec")
+    if s is None:
+        return DEFAULT_SPEC
+    m, c, cap = s
+    return ProblemSpec(int(m), int(c), int(cap))
+
+def _parse_start(req: dict) -> StateKey:
+    m, c, boat = req["start"]
+    if boat not in ("L", "R"):
+        raise ValueError(f"boat must be L or R, got {boat!r}")
+    return StateKey(int(m), int(c), boat)
+
+class SolverService:
+    """Request handling shared by every connection.
+
+    - "optimal" requests that arrive within `window` seconds of each other
+      for the same (spec, method) go to the pool as one batch.
+    - identical in-flight "solve" requests share one job, and finished
+      deterministic (or seeded) solves are kept in a SolveCache LRU.
+    - graphs and distance tables stay built in the pool's workers (and in
+      this process for thread pools) between requests."""
+
+    def __init__(self, executor: Executor, *, window: float = 0.002, cache_size: int = 4096):
+        self.executor = executor
+        self.window = window
+        self.cache = SolveCache(maxsize=cache_size)
+        self._pending: Dict[Tuple[ProblemSpec, str], List[Tuple[StateKey, asyncio.Future]]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"requests": 0, "errors": 0, "solves": 0, "coalesced": 0, "cache_hits": 0, "batches": 0, "batched_starts": 0}
+
+    async def handle(self, req: dict) -> dict:
+        self.stats["requests"] += 1
+        rid = req.get("id")
+        try:
+            op = req.get("op", "solve")
+            if op == "solve":
+                out = await self._solve(req)
+            elif op == "optimal":
+                out = {"optimal": await self._optimal(req)}
+            elif op == "ping":
+                out = {}
+            elif op == "stats":
+                out = {"stats": dict(self.stats)}
+            else:
+                raise ValueError(f"unknown op {op!r}")
+        except Exception as e:  # report, keep serving
+            self.stats["errors"] += 1
+            return {"id": rid, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        out["id"] = rid
+        out["ok"] = True
+        return out
+
+    async def _solve(self, req: dict) -> dict:
+        algo = req.get("algo", "bfs")
+        if algo not in SOLVERS:
+            raise ValueError(f"unknown algo {algo!r}")
+        spec, start, seed = _parse_spec(req), _parse_start(req), req.get("seed")
+        key = self.cache.key(SOLVERS[algo], start, spec, seed)
+        hit = self.cache.get(key) if key is not None else None
+        if hit is not None:
+            self.stats["cache_hits"] += 1
+            res, path = hit
+            res = dict(res, cached=True)
+            path = [[k.m_left, k.c_left, k.boat] for k in path]
+        elif key is not None and key in self._inflight:
+            self.stats["coalesced"] += 1
+            res, path = await self._inflight[key]
+        else:
+            self.stats["solves"] += 1
+            loop = asyncio.get_running_loop()
+            fut = loop.run_in_executor(self.executor, _solve_job, algo, spec, start, seed)
+            if key is not None:
+                self._inflight[key] = fut
+            try:
+                res, path = await fut
+            finally:
+                self._inflight.pop(key, None)
+            if key is not None:
+                self.cache.put(key, res, [StateKey(*k) for k in path])
+        out = dict(res)
+        if req.get("path", True):
+            out["path"] = path
+        return out
+
+    async def _optimal(self, req: dict) -> Optional[int]:
+        spec, start = _parse_spec(req), _parse_start(req)
+        method = req.get("method", "table")
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        bucket = (spec, method)
+        if bucket not in self._pending:
+            self._pending[bucket] = []
+            loop.call_later(self.window, self._flush, bucket)
+        self._pending[bucket].append((start, fut))
+        return await fut
+
+    def _flush(self, bucket):
+        items = self._pending.pop(bucket)
+        spec, method = bucket
+        self.stats["batches"] += 1
+        self.stats["batched_starts"] += len(items)
+        job = asyncio.get_running_loop().run_in_executor(self.executor, _optimal_batch, spec, [s for s, _ in items], method)
+
+        def done(job):
+            err = job.exception()
+            for i, (_, fut) in enumerate(items):
+                if fut.done():
+                    continue
+                if err is not None:
+                    fut.set_exception(err)
+                else:
+                    fut.set_result(job.result()[i])
+        job.add_done_callback(done)
+
+    async def connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line: bytes):
+            try:
+                req = json.loads(line)
+                if not isinstance(req, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                self.stats["errors"] += 1
+                reply = {"id": None, "ok": False, "error": f"bad request: {e}"}
+            else:
+                reply = await self.handle(req)
+            async with lock:
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    t = asyncio.ensure_future(answer(line))
+                    tasks.add(t)
+                    t.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def serve(*, host: str = "127.0.0.1", port: int = DEFAULT_PORT, unix: Optional[str] = None, workers: Optional[int] = None, threads: bool = False, window: float = 0.002, warm: Tuple[ProblemSpec, ...] = (DEFAULT_SPEC,)):
+    """Run until cancelled. threads=True uses a thread pool (shared warm
+    state, no pickling, but the GIL serializes solving and randomized solvers
+    run one at a time); the default process pool keeps each worker's graphs
+    and tables warm instead."""
+    workers = workers or os.cpu_count() or 1
+    executor = ThreadPoolExecutor(workers) if threads else ProcessPoolExecutor(workers)
+    service = SolverService(executor, window=window)
+    loop = asyncio.get_running_loop()
+    # build the common specs' graphs/tables up front, once per worker
+    for spec in warm:
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm, spec) for _ in range(workers)))
+    if unix:
+        server = await asyncio.start_unix_server(service.connection, path=unix)
+        where = unix
+    else:
+        server = await asyncio.start_server(service.connection, host, port)
+        where = f"{host}:{port}"
+    print(f"solver service listening on {where} ({workers} {'threads' if threads else 'processes'})", flush=True)
+    # SIGTERM (kill, service managers, loadTest --spawn) ends serve_forever
+    # like Ctrl-C does, so the pool is shut down instead of orphaned
+    serving = asyncio.current_task()
+    loop.add_signal_handler(signal.SIGTERM, serving.cancel)
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        executor.shutdown(cancel_futures=True)
+        if unix and os.path.exists(unix):
+            os.unlink(unix)
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve the solvers over a unix socket or localhost TCP.")
+    ap.add_argument("--unix", default=None, help="unix socket path (instead of TCP)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--workers", type=int, default=None, help="pool size (default: CPU count)")
+    ap.add_argument("--threads", action="store_true", help="thread pool instead of processes")
+    ap.add_argument("--window", type=float, default=0.002, help="seconds to collect 'optimal' requests into one batch")
+    args = ap.parse_args()
+    try:
+        asyncio.run(serve(host=args.host, port=args.port, unix=args.unix, workers=args.workers, threads=args.threads, window=args.window))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# Precompiled state graph: dense ids for valid states + CSR adjacency
+
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey
+from nodePool import PoolNode, pack_key, expand_id, band
+
+class StateGraph:
+    """All valid states of a ProblemSpec, numbered 0..n-1 in the
+    (m_left, c_left, boat) order used by successors(order="deterministic").
+
+    Edges of state u are targets[offsets[u]:offsets[u+1]], each labelled with
+    an index into spec.moves in labels[...]; goal[u] is 1 for (0,0,'R').
+    When (0,0,'R') itself is unsafe (more cannibals than missionaries, with
+    missionaries on the right) there is no goal: goal_id is None and every
+    search comes back empty, as successors()-based solvers do.
+
+    Dense ids follow the band layout of nodePool.band(), kept as c_lo /
+    col_off: id = (col_off[m] + c - c_lo[m]) * 2 + (boat == 'R'). Code that
+    numbers valid states without building a graph (tableFile's format,
+    vectorBFS) uses the same two arrays.
+
+    The arrays are read-only once built and shared between searches (and
+    threads); start_graph() handles starts that aren't valid states."""
+
+    def __init__(self, spec: ProblemSpec = DEFAULT_SPEC):
+        self.spec = spec
+        M, C = spec.total_m, spec.total_c
+        self.keys: List[StateKey] = []
+        self.index: Dict[int, int] = {}   # packed id -> dense id
+        self.c_lo, self.col_off = band(spec)
+        for m in range(M + 1):
+            c_lo = self.c_lo[m]
+            for c in range(c_lo, c_lo + self.col_off[m + 1] - self.col_off[m]):
+                for boat in ('L', 'R'):
+                    k = StateKey(m, c, boat)
+                    self.index[pack_key(k, spec)] = len(self.keys)
+                    self.keys.append(k)
+        n = self.n_valid = len(self.keys)
+        self.offsets = array('i', [0]) * (n + 1)
+        self.targets = array('i')
+        self.labels = array('h')
+        self.goal = bytearray(n)
+        for u, k in enumerate(self.keys):
+            for v, mi in expand_id(pack_key(k, spec), spec):
+                self.targets.append(self.index[v])
+                self.labels.append(mi)
+            self.offsets[u + 1] = len(self.targets)
+        self.goal_id: Optional[int] = self.index.get(pack_key(StateKey(0, 0, 'R'), spec))
+        if self.goal_id is not None:
+            self.goal[self.goal_id] = 1
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def id_of(self, k: StateKey) -> Optional[int]:
+        return self.index.get(pack_key(k, self.spec))
+
+    def _with_start(self, k: StateKey) -> "StateGraph":
+        # private copy with k appended as node n_valid, outgoing edges only
+        g = StateGraph.__new__(StateGraph)
+        g.__dict__.update(self.__dict__)
+        g.keys = self.keys + [k]
+        g.index = dict(self.index)
+        g.index[pack_key(k, self.spec)] = self.n_valid
+        g.goal = self.goal + b"\0"
+        g.targets, g.labels, g.offsets = array('i', self.targets), array('h', self.labels), array('i', self.offsets)
+        for v, mi in expand_id(pack_key(k, self.spec), self.spec):
+            g.targets.append(self.index[v])
+            g.labels.append(mi)
+        g.offsets.append(len(g.targets))
+        return g
+
+@lru_cache(maxsize=None)
+def _graph(spec: ProblemSpec) -> StateGraph:
+    return StateGraph(spec)
+
+def get_graph(spec: ProblemSpec = DEFAULT_SPEC) -> StateGraph:
+    """The shared StateGraph of spec, compiled on first use."""
+    return _graph(spec)
+
+@lru_cache(maxsize=64)
+def _unsafe_start_graph(spec: ProblemSpec, k: StateKey) -> StateGraph:
+    return get_graph(spec)._with_start(k)
+
+def start_graph(start: StateKey, spec: ProblemSpec = DEFAULT_SPEC) -> Tuple[StateGraph, Optional[int]]:
+    """(graph, dense start id) for a search from start; id None if start is
+    out of bounds. Unsafe (but in-bounds) starts such as data.TEST_CASES'
+    (1,3,'L') get a copy of the shared graph with one extra node, id
+    n_valid, holding only outgoing edges, so the graph solvers accept the
+    same starts as successors() does without touching the shared arrays."""
+    g = get_graph(spec)
+    u = g.id_of(start)
+    if u is not None:
+        return g, u
+    if not (0 <= start.m_left <= spec.total_m and 0 <= start.c_left <= spec.total_c):
+        return g, None
+    return _unsafe_start_graph(spec, start), g.n_valid
+
+# -------- Search Trees over a StateGraph --------
+class GraphTree:
+    """Parent / move / g buffers indexed by dense graph id."""
+
+    def __init__(self, graph: StateGraph):
+        self.graph = graph
+        n = len(graph)
+        self.parent = array('i', [-1]) * n
+        self.move = array('h', [-1]) * n
+        self.g = array('i', [-1]) * n
+
+    def seen(self, u: int) -> bool:
+        return self.g[u] >= 0
+
+    def add(self, v: int, parent: int, move_idx: int, g: int):
+        self.parent[v] = parent
+        self.move[v] = move_idx
+        self.g[v] = g
+
+    def key_of(self, u: int) -> StateKey:
+        return self.graph.keys[u]
+
+    def node(self, u: int) -> PoolNode:
+        return PoolNode(self, u)
+
+    def path_ids(self, u: int) -> List[int]:
+        seq = []
+        while u >= 0:
+            seq.append(u)
+            u = self.parent[u]
+        seq.reverse()
+        return seq
+
+    def path_keys(self, u: int) -> List[StateKey]:
+        keys = self.graph.keys
+        return [keys[i] for i in self.path_ids(u)]
+
+class GraphTrace:
+    """A walk over a StateGraph (ids + move labels in visiting order), for
+    local search that may revisit states.
+
+    With loop_erased=True, stepping onto a state already on the trace cuts
+    the trace back to that state instead, so it stays a simple path and never
+    holds more than one entry per distinct state."""
+
+    def __init__(self, graph: StateGraph, start: int, *, loop_erased: bool = False):
+        self.graph = graph
+        self.ids = array('i', [start])
+        self.move = array('h', [-1])
+        self.g = array('i', [0])
+        self.at: Optional[Dict[int, int]] = {start: 0} if loop_erased else None
+
+    def step(self, v: int, move_idx: int) -> int:
+        at = self.at
+        if at is not None:
+            pos = at.get(v)
+            if pos is not None:
+                for u in self.ids[pos + 1:]:
+                    del at[u]
+                del self.ids[pos + 1:], self.move[pos + 1:], self.g[pos + 1:]
+                return pos
+            at[v] = len(self.ids)
+        self.ids.append(v)
+        self.move.append(move_idx)
+        self.g.append(len(self.g))
+        return len(self.ids) - 1
+
+    def key_of(self, pos: int) -> StateKey:
+        return self.graph.keys[self.ids[pos]]
+
+    def node(self, pos: int) -> PoolNode:
+        return PoolNode(self, pos)
+
+    def path_keys(self, pos: int) -> List[StateKey]:
+        keys = self.graph.keys
+        return [keys[self.ids[i]] for i in range(pos + 1)]
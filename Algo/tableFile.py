@@ -0,0 +1,226 @@
+# Memory-mapped distance/policy tables: build once, share between processes
+
+import argparse
+import mmap
+from functools import lru_cache
+import struct
+import sys
+from array import array
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: only as_numpy() needs NumPy
+    np = None
+
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, Metrics
+from nodePool import KeyPath, band
+from retrograde import DistanceTable, get_distance_table
+
+# -------- File layout --------
+# little-endian, sections 8-byte aligned:
+#   header   MAGIC, version, move width (1 = int8, 2 = int16), M, C, capacity, n
+#   col_off  int32[M + 2]  first dense id / 2 of each missionary column
+#   dist     int32[n]      optimal trips to the goal, -1 if unreachable
+#   move     int8[n]       index into spec.moves of the first optimal move,
+#                          -1 at the goal and at dead states (int16 when the
+#                          spec has more than 127 moves)
+# Dense ids are StateGraph's: (m, c, boat) in that order over valid states
+# only, so id = (col_off[m] + c - c_lo[m]) * 2 + (boat == 'R'), with c_lo /
+# col_off from nodePool.band(); opening a file checks its col_off against it.
+MAGIC = b"MCDT"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIIII")
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+def write_table(spec: ProblemSpec, path: str, table: Optional[DistanceTable] = None):
+    """Write the retrograde table of spec (built if not given) to path."""
+    table = table or get_distance_table(spec)
+    g = table.graph
+    n = g.n_valid
+    wide = len(spec.moves) > 127
+    moves = array('h' if wide else 'b', [-1]) * n
+    for u in range(n):
+        if table.dist[u] > 0:
+            moves[u] = g.labels[table.best_move(u)]
+    col_off = array('i', g.col_off)
+    dist = array('i', table.dist[:n])
+    if sys.byteorder != "little":
+        for a in (col_off, dist, moves):
+            a.byteswap()
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 2 if wide else 1, spec.total_m, spec.total_c, spec.capacity, n))
+        for a in (col_off, dist, moves):
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(a.tobytes())
+
+class MappedTable:
+    """Read-only view of a write_table file through mmap.
+
+    Arrays are memoryview casts of the mapping (no copy), so every process
+    that opens the same file shares one page-cached copy, and distance /
+    move lookups are a single index computation."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, M, C, cap, n = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a distance table file (magic={magic!r}, version={version})")
+        self.spec = ProblemSpec(M, C, cap)
+        self.n = n
+        buf = memoryview(self._mm)
+        off_pos = _align(_HEADER.size)
+        self._dist_pos = _align(off_pos + 4 * (M + 2))
+        self._move_pos = _align(self._dist_pos + 4 * n)
+        self.col_off = self._section(buf, off_pos, M + 2, 'i', 4)
+        self.dist = self._section(buf, self._dist_pos, n, 'i', 4)
+        self.move = self._section(buf, self._move_pos, n, 'b' if width == 1 else 'h', width)
+        buf.release()
+        self.c_lo, col_off = band(self.spec)
+        if list(self.col_off) != list(col_off) or 2 * col_off[-1] != n:
+            self.close()
+            raise ValueError(f"{path}: state layout differs from StateGraph's for {M}/{C}/{cap}")
+
+    @staticmethod
+    def _section(buf: memoryview, pos: int, count: int, fmt: str, size: int):
+        view = buf[pos:pos + count * size]
+        if sys.byteorder == "little":
+            return view.cast(fmt)
+        # big-endian host: one swapped copy
+        a = array(fmt, view.tobytes())
+        a.byteswap()
+        return a
+
+    def close(self):
+        # raises BufferError while arrays from as_numpy() are still alive
+        for name in ("col_off", "dist", "move"):
+            v = getattr(self, name)
+            if isinstance(v, memoryview):
+                v.release()
+        self._mm.close()
+
+    def id_of(self, k: StateKey) -> Optional[int]:
+        M, C = self.spec.total_m, self.spec.total_c
+        if not (0 <= k.m_left <= M and 0 <= k.c_left <= C):
+            return None
+        m = k.m_left
+        c = k.c_left - self.c_lo[m]
+        if not (0 <= c < self.col_off[m + 1] - self.col_off[m]):
+            return None
+        return (self.col_off[m] + c) * 2 + (1 if k.boat == 'R' else 0)
+
+    def distance(self, k: StateKey) -> Optional[int]:
+        """Optimal trip count from k, or None if the goal is unreachable."""
+        u = self.id_of(k)
+        if u is not None:
+            d = self.dist[u]
+            return d if d >= 0 else None
+        # unsafe (but in-bounds) start: one step onto the table
+        best = None
+        for mv in self._first_moves(k):
+            d = self.distance(_apply(k, mv))
+            if d is not None and (best is None or d + 1 < best):
+                best = d + 1
+        return best
+
+    def __call__(self, k: StateKey, spec: Optional[ProblemSpec] = None) -> int:
+        # perfect heuristic, same call shape as heuristic_trips_remaining(k, spec)
+        d = self.distance(k)
+        return self.n if d is None else d
+
+    def best_move(self, k: StateKey) -> Optional[Tuple[int, int]]:
+        """(missionaries, cannibals) to ferry from k on an optimal path, or
+        None at the goal and at states that cannot reach it."""
+        u = self.id_of(k)
+        if u is None:
+            d = self.distance(k)
+            if d is None:
+                return None
+            for mv in self._first_moves(k):
+                if self.distance(_apply(k, mv)) == d - 1:
+                    return mv
+            return None
+        i = self.move[u]
+        return self.spec.moves[i] if i >= 0 else None
+
+    def optimal_path(self, start: StateKey):
+        """Follow best_move from start: an optimal path in O(path) lookups,
+        as a goal handle for reconstruct_path/play_animation."""
+        if self.distance(start) is None:
+            return None
+        keys = [start]
+        mv = self.best_move(start)
+        while mv is not None:
+            keys.append(_apply(keys[-1], mv))
+            mv = self.best_move(keys[-1])
+        path = KeyPath(keys)
+        return path.node(len(path) - 1)
+
+    def as_numpy(self):
+        """(dist, move) as NumPy arrays over the same mapping (no copy)."""
+        if np is None:
+            raise RuntimeError("as_numpy needs NumPy")
+        dt = np.int8 if self.move.itemsize == 1 else "<i2"
+        dist = np.frombuffer(self._mm, dtype="<i4", count=self.n, offset=self._dist_pos)
+        move = np.frombuffer(self._mm, dtype=dt, count=self.n, offset=self._move_pos)
+        return dist, move
+
+    def _first_moves(self, k: StateKey):
+        M, C = self.spec.total_m, self.spec.total_c
+        for mv in self.spec.moves:
+            k2 = _apply(k, mv)
+            if 0 <= k2.m_left <= M and 0 <= k2.c_left <= C and self.id_of(k2) is not None:
+                yield mv
+
+def _apply(k: StateKey, mv: Tuple[int, int]) -> StateKey:
+    dm, dc = mv
+    if k.boat == 'L':
+        return StateKey(k.m_left - dm, k.c_left - dc, 'R')
+    return StateKey(k.m_left + dm, k.c_left + dc, 'L')
+
+@lru_cache(maxsize=None)
+def load_table(path: str) -> MappedTable:
+    """MappedTable of path, mapped once per process."""
+    return MappedTable(path)
+
+def mapped_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC, path: Optional[str] = None):
+    # retrograde_solver over a table file; path defaults to table_<M>_<C>_<cap>.bin
+    table = load_table(path or f"table_{spec.total_m}_{spec.total_c}_{spec.capacity}.bin")
+    if table.spec != spec:
+        raise ValueError(f"{table.path} holds {table.spec}, not {spec}")
+    goal = table.optimal_path(start)
+    if goal is not None:
+        metr.expanded += goal.g + 1   # states read along the path
+        metr.track_frontier(1)
+    return goal
+
+def main():
+    ap = argparse.ArgumentParser(description="Build or query a memory-mapped distance/policy table.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="run the retrograde BFS and write the table")
+    b.add_argument("m", type=int)
+    b.add_argument("c", type=int)
+    b.add_argument("capacity", type=int)
+    b.add_argument("-o", "--output", default=None, help="default: table_<M>_<C>_<cap>.bin")
+    q = sub.add_parser("query", help="optimal distance and move from one state")
+    q.add_argument("path")
+    q.add_argument("m_left", type=int)
+    q.add_argument("c_left", type=int)
+    q.add_argument("boat", choices=("L", "R"))
+    args = ap.parse_args()
+    if args.cmd == "build":
+        spec = ProblemSpec(args.m, args.c, args.capacity)
+        out = args.output or f"table_{spec.total_m}_{spec.total_c}_{spec.capacity}.bin"
+        write_table(spec, out)
+        print(f"wrote {out}: {spec}")
+    else:
+        t = load_table(args.path)
+        k = StateKey(args.m_left, args.c_left, args.boat)
+        print(f"{t.spec} {k}: distance={t.distance(k)} move={t.best_move(k)}")
+
+if __name__ == "__main__":
+    main()
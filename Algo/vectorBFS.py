@@ -0,0 +1,116 @@
+#Vectorized layer-synchronous BFS (NumPy)
+
+try:
+    import numpy as np
+except ImportError:  # optional: only this engine needs NumPy
+    np = None
+
+from allItem import ProblemSpec, DEFAULT_SPEC, StateKey, Metrics, run_single, run_all_extended
+from nodePool import KeyPath, band
+from retrograde import optimal_lengths
+from data import TEST_CASES
+
+ALGO_NAME = "Vector BFS"
+
+UNSEEN = -1
+START = -2
+
+def _move_dtype(spec: ProblemSpec):
+    return np.int8 if len(spec.moves) < 127 else np.int16
+
+def vector_bfs_solver(start: StateKey, metr: Metrics, *, spec: ProblemSpec = DEFAULT_SPEC):
+    """BFS one whole layer at a time.
+
+    The visited set is `parent`, indexed by StateGraph's dense ids
+    (col_off[m] + c - c_lo[m]) * 2 + boat and holding the index of the move
+    that first reached each valid state, so memory grows with the band of
+    valid states rather than the (TOTAL_M+1) x (TOTAL_C+1) grid. The
+    frontier is kept as coordinate arrays and every move is applied to a
+    whole layer by broadcasting. Pays off when layers are wide (C well below
+    M, or a big boat); on the thin M == C band each layer is a few states and
+    the per-layer NumPy overhead leaves it a little behind bfs_solver."""
+    if np is None:
+        raise RuntimeError("vector_bfs_solver needs NumPy")
+    M, C = spec.total_m, spec.total_c
+    if not (0 <= start.m_left <= M and 0 <= start.c_left <= C):
+        return None
+    b0 = 1 if start.boat == 'R' else 0
+    s0 = (start.m_left, start.c_left, b0)
+    # StateGraph's layout, without building the graph itself
+    c_lo, col_off = (np.array(a, dtype=np.int64) for a in band(spec))
+    # (0,0,'R') is a valid state unless cannibals outnumber missionaries there
+    goal = 1 if c_lo[0] == 0 and s0 != (0, 0, 1) else None
+    dm = np.array([m for m, _ in spec.moves], dtype=np.int64)
+    dc = np.array([c for _, c in spec.moves], dtype=np.int64)
+    mi = np.arange(len(spec.moves), dtype=np.int64)
+    parent = np.full(2 * int(col_off[-1]), UNSEEN, dtype=_move_dtype(spec))
+    # an unsafe start has no dense id; valid moves never lead back to it
+    if 0 <= start.c_left - c_lo[start.m_left] < col_off[start.m_left + 1] - col_off[start.m_left]:
+        parent[(col_off[start.m_left] + start.c_left - c_lo[start.m_left]) * 2 + b0] = START
+    fm = np.array([start.m_left], dtype=np.int64)
+    fc = np.array([start.c_left], dtype=np.int64)
+    fb = np.array([b0], dtype=np.int64)
+    while fm.size:
+        metr.track_frontier(int(fm.size))
+        metr.expanded += int(fm.size)
+        if goal is None or parent[goal] != UNSEEN:
+            break
+        # boat on the left subtracts the load, boat on the right adds it back
+        sign = (2 * fb - 1)[:, None]
+        cm = (fm[:, None] + sign * dm).ravel()
+        cc = (fc[:, None] + sign * dc).ravel()
+        cb = np.repeat(1 - fb, dm.size)
+        cmi = np.tile(mi, fm.size)
+        ok = (cm >= 0) & (cm <= M) & (cc >= 0) & (cc <= C)
+        ok &= (cm == 0) | (cc <= cm)
+        ok &= (cm == M) | (C - cc <= M - cm)
+        cm, cc, cb, cmi = cm[ok], cc[ok], cb[ok], cmi[ok]
+        cid = (col_off[cm] + cc - c_lo[cm]) * 2 + cb
+        new = parent[cid] == UNSEEN
+        cm, cc, cb, cmi, cid = cm[new], cc[new], cb[new], cmi[new], cid[new]
+        # one parent per state: keep the first candidate for each dense id
+        _, first = np.unique(cid, return_index=True)
+        fm, fc, fb = cm[first], cc[first], cb[first]
+        parent[cid[first]] = cmi[first]
+    if s0 != (0, 0, 1) and (goal is None or parent[goal] == UNSEEN):
+        return None
+    # walk parent moves back from the goal
+    keys = []
+    m, c, b = 0, 0, 1
+    while True:
+        keys.append(StateKey(m, c, 'R' if b else 'L'))
+        if (m, c, b) == s0:
+            break
+        i = int(parent[(col_off[m] + c - c_lo[m]) * 2 + b])
+        mm, cc_ = spec.moves[i]
+        if b:
+            m, c, b = m + mm, c + cc_, 0
+        else:
+            m, c, b = m - mm, c - cc_, 1
+    keys.reverse()
+    path = KeyPath(keys)
+    return path.node(len(path) - 1)
+
+def main():
+    optimal = optimal_lengths(TEST_CASES)
+    while True:
+        print(f"\n=== {ALGO_NAME} Menu ===")
+        print("1) Choose ONE test case → animate + show metrics")
+        print("2) Run ALL test cases (no animation) → summary table")
+        print("0) Exit")
+        sel = input("Select: ").strip()
+        if sel == "1":
+            for i,(name, s) in enumerate(TEST_CASES,1):
+                print(f"{i}) {name}: start={s}")
+            idx = int(input("Pick one: ").strip()) - 1
+            name, start = TEST_CASES[idx]
+            run_single(vector_bfs_solver, start, ALGO_NAME, animate=True, anim_speed=0.6)
+        elif sel == "2":
+            run_all_extended(vector_bfs_solver, TEST_CASES, algo_name=ALGO_NAME, optimal_by_case=optimal, repeats=1)
+        elif sel == "0":
+            break
+        else:
+            print("Invalid selection.")
+
+if __name__ == "__main__":
+    main()